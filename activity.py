@@ -0,0 +1,55 @@
+import math
+import numpy as np
+
+# --- ACTIVE REGION ---
+# Entities are bucketed by the horizontal level regions their extent touches, so finding
+# the ones near the camera only looks at a few buckets instead of every entity. Only those
+# get a full update each tick; the rest sleep and are caught up when they wake.
+
+
+def active_span(center_x, view_width, margin):
+    # Horizontal pixel span that gets simulated: the camera view (placed the same way the
+    # game camera follows the player) widened by margin on both sides
+    view_left = max(0, center_x - view_width // 2)
+    return view_left - margin, view_left + view_width + margin
+
+
+class RegionIndex:
+    def __init__(self, extents, region_width):
+        # extents: (left, right) pixel span per item, e.g. a rect or a patrol range
+        self.region_width = region_width
+        self.regions = {}  # region number -> indices of the items touching it
+        for index, (left, right) in enumerate(extents):
+            for region in range(left // region_width, right // region_width + 1):
+                self.regions.setdefault(region, []).append(index)
+
+    def query(self, left, right):
+        # Sorted indices of the items in the regions overlapping [left, right]
+        found = set()
+        for region in range(left // self.region_width, right // self.region_width + 1):
+            found.update(self.regions.get(region, ()))
+        return sorted(found)
+
+
+def advance_patrol(x, direction, speed, patrol_min, patrol_max, ticks):
+    # Closed form of `ticks` patrol steps (see EnemyManager.update) for enemies inside
+    # their patrol range. Each enemy cycles through the positions it can reach in its range
+    # going forward and then back, pausing one tick at each end, so the state after any
+    # number of ticks is a phase in that cycle. Returns the new (x, direction).
+    low = x - (x - patrol_min) // speed * speed
+    high = x + (patrol_max - x) // speed * speed
+    positions = (high - low) // speed + 1
+    step = (x - low) // speed
+    phase = np.where(direction > 0, step, 2 * positions - 1 - step)
+    phase = (phase + ticks) % (2 * positions)
+    forward = phase < positions
+    new_x = np.where(forward, low + phase * speed, low + (2 * positions - 1 - phase) * speed)
+    return new_x, np.where(forward, 1, -1)
+
+
+def advance_animation(timer, frame_index, frame_count, frame_duration, dt, ticks):
+    # Approximate catch-up for a looping animation whose timer resets when it reaches
+    # frame_duration: it only needs to look plausible when the entity wakes up
+    ticks_per_frame = max(1, math.ceil(frame_duration / dt))
+    elapsed = np.round(timer / dt).astype(np.int64) + ticks
+    return (elapsed % ticks_per_frame) * dt, (frame_index + elapsed // ticks_per_frame) % frame_count
@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+import pygame
+
+# --- ASSET MANAGER ---
+# Loads every image, flipped image and font exactly once and hands the same object to
+# every caller, so recreating Player/Enemy/Checkpoint/FinishFlag on a restart does no file I/O.
+# With convert=False images are kept in their file format, which works without a display.
+class AssetManager:
+    def __init__(self, convert=True):
+        self.convert = convert
+        self.images = {}
+        self.flipped_images = {}
+        self.fonts = {}
+        self.load_times = {}  # asset key -> seconds spent loading it
+
+    def timed_load(self, key, loader):
+        start = time.perf_counter()
+        asset = loader()
+        self.load_times[key] = time.perf_counter() - start
+        return asset
+
+    def image(self, path):
+        surface = self.images.get(path)
+        if surface is None:
+            surface = self.timed_load(path, lambda: self.load_image(path))
+            self.images[path] = surface
+        return surface
+
+    def load_image(self, path):
+        return self.prepare(pygame.image.load(path))
+
+    def prepare(self, surface):
+        # The display-dependent step, main thread only
+        return surface.convert_alpha() if self.convert else surface
+
+    def add_image(self, path, surface, decode_seconds=0.0):
+        # Stores an image decoded elsewhere (see Preloader); keeps one that was loaded meanwhile
+        if path not in self.images:
+            start = time.perf_counter()
+            self.images[path] = self.prepare(surface)
+            self.load_times[path] = decode_seconds + time.perf_counter() - start
+        return self.images[path]
+
+    def preload(self, image_paths, levels=()):
+        return Preloader(self, image_paths, levels)
+
+    def flipped(self, path, flip_x=True, flip_y=False):
+        key = (path, flip_x, flip_y)
+        surface = self.flipped_images.get(key)
+        if surface is None:
+            source = self.image(path)
+            surface = self.timed_load(key, lambda: pygame.transform.flip(source, flip_x, flip_y))
+            self.flipped_images[key] = surface
+        return surface
+
+    def frames(self, paths):
+        return [self.image(path) for path in paths]
+
+    def font(self, path, size):
+        # Falls back to the default pygame font if the font file can't be loaded
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            try:
+                font = self.timed_load(key, lambda: pygame.font.Font(path, size))
+            except (OSError, pygame.error):
+                font = self.sys_font(None, size)
+            self.fonts[key] = font
+        return font
+
+    def sys_font(self, name, size):
+        key = ("sysfont", name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.timed_load(key, lambda: pygame.font.SysFont(name, size))
+            self.fonts[key] = font
+        return font
+
+    def total_load_time(self):
+        return sum(self.load_times.values())
+
+    def timing_report(self):
+        # (key, milliseconds) pairs, slowest first
+        return sorted(((key, seconds * 1000) for key, seconds in self.load_times.items()), key=lambda item: -item[1])
+
+
+# --- SCALED ASSETS ---
+# The images of an AssetManager shrunk by an integer factor, for drawing the world into a
+# low-resolution buffer (see Game). Offers the same image lookups the entities use; each
+# image is scaled once (nearest neighbour, so pixel art stays crisp) on first use.
+class ScaledAssets:
+    def __init__(self, assets, scale):
+        self.assets = assets
+        self.scale = scale
+        self.images = {}
+
+    def shrink(self, key, source):
+        surface = self.images.get(key)
+        if surface is None:
+            size = (max(1, source.get_width() // self.scale), max(1, source.get_height() // self.scale))
+            surface = self.assets.timed_load(("scaled", key, self.scale), lambda: pygame.transform.scale(source, size))
+            self.images[key] = surface
+        return surface
+
+    def image(self, path):
+        return self.shrink(path, self.assets.image(path))
+
+    def flipped(self, path, flip_x=True, flip_y=False):
+        return self.shrink((path, flip_x, flip_y), self.assets.flipped(path, flip_x, flip_y))
+
+    def frames(self, paths):
+        return [self.image(path) for path in paths]
+
+
+# --- BACKGROUND PRELOADER ---
+# Decodes images and loads level tile data (LevelInfo.load_layers) on a worker thread.
+# Decoded images can't be converted to the display format off the main thread, so the
+# worker queues them and pump(), called once per frame by whatever screen is showing,
+# converts them and hands them to the AssetManager. Anything requested before it has been
+# preloaded is simply loaded synchronously by the AssetManager as before.
+class Preloader:
+    def __init__(self, assets, image_paths, levels=()):
+        self.assets = assets
+        image_paths = list(dict.fromkeys(image_paths))
+        levels = list(levels)
+        self.total = len(image_paths) + len(levels)
+        self.completed = 0
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.work, args=(image_paths, levels), daemon=True)
+        self.thread.start()
+
+    def work(self, image_paths, levels):
+        try:
+            for path in image_paths:
+                start = time.perf_counter()
+                try:
+                    surface = pygame.image.load(path)
+                except (OSError, pygame.error):
+                    surface = None  # the AssetManager raises the error when the image is actually used
+                self.results.put((path, surface, time.perf_counter() - start))
+            for level in levels:
+                start = time.perf_counter()
+                try:
+                    level.load_layers()
+                except (OSError, ValueError):
+                    pass  # raised again when the level is loaded on the main thread
+                self.results.put((("level", level.name), None, time.perf_counter() - start))
+        except Exception as error:
+            # Anything else would end the thread silently and leave the menu waiting forever:
+            # hand it to the main thread, which raises it from pump()
+            self.results.put((None, error, 0.0))
+
+    @property
+    def done(self):
+        return self.completed == self.total
+
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 1.0
+
+    def pump(self):
+        # Main thread: convert whatever the worker has finished so far; returns done
+        while True:
+            try:
+                key, surface, seconds = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if key is None:
+                raise surface  # the worker failed (see work)
+            if surface is not None:
+                self.assets.add_image(key, surface, seconds)
+            elif isinstance(key, tuple):
+                self.assets.load_times[key] = seconds
+            self.completed += 1
+        return self.done
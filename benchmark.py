@@ -0,0 +1,271 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # no window needed; set before pygame is imported
+
+import argparse
+import json
+import platform
+import time
+import numpy as np
+import pygame
+from activity import active_span
+from assets import AssetManager, ScaledAssets
+from collision import TileGrid
+from config import WIDTH, HEIGHT, TILE_SIZE, TICK_RATE, BACKGROUND_COLOR, ACTIVE_MARGIN, RENDER_SCALE, RENDER_SCALES, \
+    STATIC_RENDER_MODE, SCROLL_REUSE
+from entities import EnemyManager, Player
+from headless import DEFAULT_SCRIPT, InputScript
+from level import LevelManifest
+from rendering import ChunkRenderer, ScrollingRenderer, TextCache, TileLayerRenderer, TilesetAtlas
+
+# --- MAIN LOOP BENCHMARK ---
+# Loads each level in levels.json (and wider synthetic copies of the default one), runs the default
+# headless input script through the same update and draw calls as the game loop, and reports
+# per-phase timings as percentiles. Results can be written as JSON and compared to an earlier run.
+
+# Phases around the static layers, which are timed one draw_<layer name> phase per layer
+# (or a single draw_static phase with --scroll)
+UPDATE_PHASES = ["input", "player", "enemies"]
+DRAW_PHASES = ["draw_sprites", "present", "hud", "flip"]
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    values = sorted(seconds * 1000 for seconds in samples)
+    return {
+        "mean_ms": sum(values) / len(values) if values else 0.0,
+        "p50_ms": percentile(values, 0.50),
+        "p90_ms": percentile(values, 0.90),
+        "p99_ms": percentile(values, 0.99),
+        "max_ms": values[-1] if values else 0.0,
+    }
+
+
+def widen(tile_map, factor):
+    # Synthetic level: the map repeated factor times side by side
+    return np.tile(tile_map, (1, factor))
+
+
+def make_renderer(layers, tile_size, render_mode):
+    if render_mode in ("streaming", "chunks"):
+        return ChunkRenderer(layers, tile_size, streaming=render_mode == "streaming")
+    return TileLayerRenderer(layers, tile_size, batched=render_mode == "batched")
+
+
+def bench_level(name, tile_layers, level, context, frames, warmup, render_mode, scroll):
+    # tile_layers: {layer name: tile array} of the level (widened for the synthetic levels)
+    screen, world_buffer, scale, world_assets, tileset_atlas, text_cache, hud_font, heart_image = context
+    world_surface = screen if world_buffer is None else world_buffer
+    tile_size = TILE_SIZE // scale
+
+    load_start = time.perf_counter()
+    collision_grid = TileGrid(tile_layers[level.collision_layer], TILE_SIZE)
+    # The level's layers in draw order, each with its own tileset (as in Game.load_game_level)
+    layers = [(f"draw_{layer_name}", (tile_layers[layer_name], tileset_atlas(tileset).get))
+              for layer_name, _, tileset in level.layers]
+    if scroll:
+        # All static layers in one scrolled render target, timed together
+        layers = [("draw_static", ScrollingRenderer(make_renderer([layer for _, layer in layers], tile_size, render_mode), BACKGROUND_COLOR))]
+    else:
+        layers = [(phase, make_renderer([layer], tile_size, render_mode)) for phase, layer in layers]
+    load_seconds = time.perf_counter() - load_start
+
+    # The level's enemies, repeated for every 200 columns of level
+    map_height, map_width = tile_layers[level.collision_layer].shape
+    spawns = []
+    for copy in range(max(1, map_width // 200)):
+        shift = copy * 200
+        for x, y, start, end in level.enemies:
+            if x + shift < map_width:
+                spawns.append(((x + shift) * TILE_SIZE, y * TILE_SIZE, (start + shift) * TILE_SIZE, (end + shift) * TILE_SIZE))
+    enemies = EnemyManager(spawns, world_assets)
+
+    player = Player(*level.player_start, world_assets, collision_grid)
+    script = InputScript.parse(DEFAULT_SCRIPT)
+    dt = 1000 / TICK_RATE
+    samples = {phase: [] for phase in UPDATE_PHASES + [phase for phase, _ in layers] + DRAW_PHASES}
+    redrawn = []  # fraction of the view the scrolled render target redrew, per frame
+    chunk_peak = 0      # most bytes of baked chunk surfaces held at once
+    chunk_renderers = [renderer.renderer if scroll else renderer for _, renderer in layers]
+    chunk_renderers = [renderer for renderer in chunk_renderers if isinstance(renderer, ChunkRenderer)]
+    view_pixels = world_surface.get_width() * world_surface.get_height()
+    clock = time.perf_counter
+
+    for frame in range(warmup + frames):
+        marks = [clock()]
+        keys = script.keys_at(frame)
+        marks.append(clock())
+
+        player.move(keys)
+        player.update(dt)
+        if player.rect.top > HEIGHT:
+            player.respawn(level.player_start)
+        marks.append(clock())
+
+        enemies.update(dt, active_span(player.rect.centerx, WIDTH, ACTIVE_MARGIN))
+        marks.append(clock())
+
+        camera_offset = (max(0, player.rect.centerx - WIDTH // 2) // scale, max(0, player.rect.centery - HEIGHT // 2) // scale)
+        if not scroll:
+            world_surface.fill(BACKGROUND_COLOR)  # the scrolled render target brings its own background
+        layer_marks = []
+        for phase, renderer in layers:
+            renderer.draw(world_surface, camera_offset)
+            layer_marks.append((phase, clock()))
+
+        enemies.draw(world_surface, camera_offset, scale=scale)
+        player.draw(world_surface, camera_offset, scale=scale)
+        sprites_done = clock()
+
+        if world_buffer is not None:
+            pygame.transform.scale(world_buffer, (WIDTH, HEIGHT), screen)
+        present_done = clock()
+
+        screen.blit(text_cache.render(hud_font, f"Kills: {frame % 10}", True, (0, 0, 0)), (10, 10))
+        screen.blit(heart_image, (WIDTH - 42, HEIGHT - 42))
+        hud_done = clock()
+
+        pygame.display.flip()
+        flip_done = clock()
+
+        if frame < warmup:
+            continue
+        if scroll:
+            redrawn.append(layers[0][1].redrawn_pixels / view_pixels)
+        if chunk_renderers:
+            chunk_peak = max(chunk_peak, sum(renderer.memory_bytes() for renderer in chunk_renderers))
+        samples["input"].append(marks[1] - marks[0])
+        samples["player"].append(marks[2] - marks[1])
+        samples["enemies"].append(marks[3] - marks[2])
+        previous = marks[3]
+        for phase, mark in layer_marks:
+            samples[phase].append(mark - previous)
+            previous = mark
+        samples["draw_sprites"].append(sprites_done - previous)
+        if world_buffer is not None:
+            samples["present"].append(present_done - sprites_done)
+        samples["hud"].append(hud_done - present_done)
+        samples["flip"].append(flip_done - hud_done)
+
+    result = {
+        "name": name,
+        "width_tiles": map_width,
+        "height_tiles": map_height,
+        "enemies": len(enemies),
+        "load_ms": load_seconds * 1000,
+        "phases": {phase: summarize(values) for phase, values in samples.items() if values},
+    }
+    if redrawn:
+        result["redrawn_fraction"] = sum(redrawn) / len(redrawn)
+    if chunk_renderers:
+        result["chunk_peak_mb"] = chunk_peak / (1024 * 1024)
+    return result
+
+
+def print_result(result, baseline=None):
+    print(f"\n{result['name']} ({result['width_tiles']}x{result['height_tiles']} tiles, "
+          f"{result['enemies']} enemies, load {result['load_ms']:.1f} ms)")
+    if "redrawn_fraction" in result:
+        print(f"  scroll reuse redrew {result['redrawn_fraction'] * 100:.1f}% of the view per frame")
+    if "chunk_peak_mb" in result:
+        print(f"  baked chunks peaked at {result['chunk_peak_mb']:.1f} MB")
+    print(f"  {'phase':<18}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for phase, stats in result["phases"].items():
+        line = f"  {phase:<18}" + "".join(f"{stats[key]:>9.3f}" for key in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"))
+        if baseline and phase in baseline["phases"]:
+            old = baseline["phases"][phase]["p50_ms"]
+            if old > 0:
+                line += f"   p50 {(stats['p50_ms'] - old) / old * 100:+.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game loop's update and draw phases.")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per level")
+    parser.add_argument("--warmup", type=int, default=60, help="unmeasured frames before measuring")
+    parser.add_argument("--scales", type=int, nargs="*", default=[10, 100],
+                        help="widths (x Finished_Map) of the synthetic levels")
+    # The defaults are the game's own settings from config.py, so a plain run measures what players run
+    parser.add_argument("--render-mode", choices=["streaming", "chunks", "batched", "per_tile"], default=STATIC_RENDER_MODE,
+                        help="static layer renderer (chunks pre-bakes the whole level, ~1 MB per 16x16-tile chunk; "
+                             "streaming bakes chunks near the camera only; default: %(default)s)")
+    parser.add_argument("--scroll", action=argparse.BooleanOptionalAction, default=SCROLL_REUSE,
+                        help="draw the static layers through a ScrollingRenderer that only redraws newly exposed strips "
+                             "(default: %(default)s)")
+    parser.add_argument("--render-scale", type=int, choices=RENDER_SCALES, default=RENDER_SCALE,
+                        help="draw the world into a buffer this many times smaller and scale it up to the window "
+                             "(default: %(default)s)")
+    parser.add_argument("--maps", nargs="*", help="levels from levels.json (default: all)")
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="JSON from an earlier run to compare p50 against")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    assets = AssetManager()
+    scale = args.render_scale
+    world_assets = assets if scale == 1 else ScaledAssets(assets, scale)
+    atlases = {}
+
+    def tileset_atlas(path):
+        if path not in atlases:
+            atlases[path] = TilesetAtlas(world_assets.image(path), TILE_SIZE // scale)
+        return atlases[path]
+
+    context = (
+        screen,
+        None if scale == 1 else pygame.Surface((WIDTH // scale, HEIGHT // scale)).convert(),
+        scale,
+        world_assets,
+        tileset_atlas,
+        TextCache(),
+        assets.sys_font(None, 28),
+        assets.image("heart_0.png"),
+    )
+
+    manifest = LevelManifest.load()
+    levels = []
+    for name in manifest.levels if args.maps is None else args.maps:
+        level = manifest.get(name)
+        levels.append((name, level.load_layers(), level))
+    default = manifest.get()
+    layers = default.load_layers()
+    for factor in args.scales:
+        levels.append((f"{default.name} x{factor}", {name: widen(tile_map, factor) for name, tile_map in layers.items()}, default))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = {result["name"]: result for result in json.load(baseline_file)["results"]}
+
+    results = []
+    for name, tile_layers, level in levels:
+        result = bench_level(name, tile_layers, level, context, args.frames, args.warmup,
+                             args.render_mode, args.scroll)
+        print_result(result, baseline.get(name))
+        results.append(result)
+
+    if args.json:
+        report = {
+            "render_mode": args.render_mode,
+            "scroll": args.scroll,
+            "render_scale": args.render_scale,
+            "frames": args.frames,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "results": results,
+        }
+        with open(args.json, "w") as json_file:
+            json.dump(report, json_file, indent=2)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
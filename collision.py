@@ -0,0 +1,114 @@
+import math
+import numpy as np
+import pygame
+from level import solid_mask
+
+
+def pixel_round(value):
+    # Rounds halves away from zero, the same as assigning a float to a Rect attribute
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+def merge_solid_cells(mask):
+    # Greedy meshing: every row is split into maximal runs of solid cells, and a run that
+    # spans exactly the same columns as a block from the row above extends that block down.
+    # Returns (col, row, width, height) blocks in cells that cover every solid cell once.
+    blocks = []
+    open_blocks = {}  # (first col, last col + 1) -> index into blocks
+    for row, cells in enumerate(np.asarray(mask, dtype=bool)):
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], cells, [False])).astype(np.int8)))
+        still_open = {}
+        for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            index = open_blocks.get((start, end))
+            if index is None:
+                index = len(blocks)
+                blocks.append([start, row, end - start, 0])
+            blocks[index][3] += 1
+            still_open[(start, end)] = index
+        open_blocks = still_open
+    return [tuple(block) for block in blocks]
+
+
+# --- TILE COLLISION GRID ---
+# Uniform grid over the tile map: every cell knows which solid rect covers it, so a
+# collision query only looks at the few cells under a rect instead of every tile.
+# Adjacent solid cells are merged into larger rects, and queries return those merged rects,
+# so the player tests a floor or wall once instead of once per tile and never catches on
+# the seam between two tiles.
+class TileGrid:
+    def __init__(self, tile_map, tile_size, solid_borders=True):
+        self.tile_size = tile_size
+        mask = solid_mask(tile_map, solid_borders)
+        self.height, self.width = mask.shape
+
+        # Merged rects, and for every cell the index of the rect covering it (-1 if empty)
+        self.rects = []
+        owner = np.full(mask.shape, -1, dtype=np.int32)
+        for col, row, width, height in merge_solid_cells(mask):
+            owner[row:row + height, col:col + width] = len(self.rects)
+            self.rects.append(pygame.Rect(col * tile_size, row * tile_size, width * tile_size, height * tile_size))
+        self.owner = owner.ravel().tolist()
+
+    def cell_range(self, rect):
+        # Inclusive column/row span covered by rect, clamped to the map
+        size = self.tile_size
+        left = max(0, rect.left // size)
+        right = min(self.width - 1, (rect.right - 1) // size)
+        top = max(0, rect.top // size)
+        bottom = min(self.height - 1, (rect.bottom - 1) // size)
+        return left, right, top, bottom
+
+    def overlapping(self, rect):
+        # Merged solid rects touching the cells under rect, each once, in row-major order
+        left, right, top, bottom = self.cell_range(rect)
+        owner = self.owner
+        seen = []
+        for row in range(top, bottom + 1):
+            start = row * self.width
+            for col in range(left, right + 1):
+                index = owner[start + col]
+                if index != -1 and index not in seen:
+                    seen.append(index)
+        return [self.rects[index] for index in seen]
+
+    def sweep(self, rect, dx, dy):
+        # Swept AABB: moves rect by (dx, dy) pixels as far as it can go before touching a
+        # solid rect and returns (dx, dy, hit), where hit is the rect it stopped against or
+        # None. One query covers the whole move, so nothing is skipped however fast it is.
+        # Rects that rect already overlaps are ignored; getting out of those is up to the caller.
+        if not dx and not dy:
+            return 0, 0, None
+        hit = None
+        hit_time = 1.0
+        hit_on_x = False
+        for tile in self.overlapping(rect.union(rect.move(dx, dy))):
+            if rect.colliderect(tile):
+                continue
+            # Times (as fractions of the move) at which the two rects start and stop overlapping per axis
+            if dx > 0:
+                x_entry, x_exit = (tile.left - rect.right) / dx, (tile.right - rect.left) / dx
+            elif dx < 0:
+                x_entry, x_exit = (tile.right - rect.left) / dx, (tile.left - rect.right) / dx
+            elif rect.right <= tile.left or rect.left >= tile.right:
+                continue
+            else:
+                x_entry, x_exit = -math.inf, math.inf
+            if dy > 0:
+                y_entry, y_exit = (tile.top - rect.bottom) / dy, (tile.bottom - rect.top) / dy
+            elif dy < 0:
+                y_entry, y_exit = (tile.bottom - rect.top) / dy, (tile.top - rect.bottom) / dy
+            elif rect.bottom <= tile.top or rect.top >= tile.bottom:
+                continue
+            else:
+                y_entry, y_exit = -math.inf, math.inf
+            entry = max(x_entry, y_entry)
+            if 0 <= entry < hit_time and entry < min(x_exit, y_exit):
+                hit, hit_time, hit_on_x = tile, entry, x_entry >= y_entry
+        if hit is None:
+            return dx, dy, None
+        # Snap exactly against the edge that was hit, the other axis travels as far as the hit allows
+        if hit_on_x:
+            moved_x = hit.left - rect.right if dx > 0 else hit.right - rect.left
+            return moved_x, int(dy * hit_time), hit
+        moved_y = hit.top - rect.bottom if dy > 0 else hit.bottom - rect.top
+        return int(dx * hit_time), moved_y, hit
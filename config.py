@@ -0,0 +1,42 @@
+# Game Constants
+WIDTH, HEIGHT = 800, 600
+TILE_SIZE = 32
+GRAVITY = 0.6
+JUMP_STRENGTH = -14
+
+# Simulation runs at a fixed TICK_RATE (all movement constants are per tick at 60 Hz);
+# rendering runs at RENDER_FPS (0 = uncapped) and is interpolated between ticks
+TICK_RATE = 60
+MAX_CATCH_UP_STEPS = 5
+RENDER_FPS = 60
+
+# How the loop waits for the next frame (see pacing.py): "sleep" (Clock.tick), "hybrid"
+# (sleep, then spin for the last few ms), "tick_busy_loop" (spin) or "uncapped"
+FRAME_PACING = "sleep"
+PACING_MODES = ("sleep", "hybrid", "tick_busy_loop", "uncapped")
+
+# The world is drawn into a buffer RENDER_SCALE times smaller than the window and scaled up
+# once per frame (1 = draw at full resolution); WIDTH, HEIGHT and TILE_SIZE must divide by it
+RENDER_SCALE = 1
+RENDER_SCALES = (1, 2, 4)
+
+# How the static layers are drawn: "streaming" (chunk surfaces baked ahead of the camera and
+# evicted behind it), "chunks" (every chunk pre-baked at load), "batched" (visible tiles
+# submitted with one blits call per layer) or "per_tile" (one blit per visible tile, for comparison)
+STATIC_RENDER_MODE = "streaming"
+
+# Keep the static layers in a render target that is scrolled with the camera, so only the
+# strips that scroll into view are drawn each frame (see ScrollingRenderer)
+SCROLL_REUSE = True
+
+# Push only the changed parts of menus shown over a frozen scene (pause, game over, win) with
+# display.update(rects) instead of redrawing and flipping the whole frame
+DIRTY_RECT_UPDATES = True
+
+# Entities are only simulated within ACTIVE_MARGIN px of the camera view; the level is
+# split into REGION_WIDTH px wide buckets to find them
+ACTIVE_MARGIN = 256
+REGION_WIDTH = 512
+
+# Colors
+BACKGROUND_COLOR = (252,223,205,255)
@@ -0,0 +1,374 @@
+import numpy as np
+import pygame
+from pygame.locals import K_a, K_d, K_SPACE, K_LSHIFT
+from activity import RegionIndex, advance_animation, advance_patrol
+from collision import pixel_round
+from config import GRAVITY, JUMP_STRENGTH, REGION_WIDTH
+from timestep import interpolate
+
+# Every image the entities use, so they can be preloaded before the first world is built
+CHECKPOINT_FRAMES = [f"checkpoint_{i}.png" for i in range(6)]
+CHECKPOINT_GREEN_FRAMES = [f"checkpoint_green_{i}.png" for i in range(6)]
+FINISH_FLAG_FRAMES = [f"finish_flag_{i}.png" for i in range(6)]
+PLAYER_WALK_FRAMES = ["player_0.png", "player_1.png", "player_2.png", "player_3.png", "player_2.png", "player_1.png"]
+ENEMY_FRAMES = ["enemy_1.png", "enemy_2.png"]
+ENTITY_IMAGES = CHECKPOINT_FRAMES + CHECKPOINT_GREEN_FRAMES + FINISH_FLAG_FRAMES + PLAYER_WALK_FRAMES + ENEMY_FRAMES
+
+# --- CHECKPOINT CLASS ---
+class Checkpoint:
+    def __init__(self, x, y, assets):
+        self.rect = pygame.Rect(x, y, 64, 64)
+        self.activated = False
+        self.frames_red = assets.frames(CHECKPOINT_FRAMES)
+        self.frames_green = assets.frames(CHECKPOINT_GREEN_FRAMES)
+        self.frame_index = 0
+        self.animation_timer = 0
+        self.frame_duration = 150  # ms
+        self.display_message = False
+        self.message_timer = 0
+
+    def update(self, dt):
+        self.animation_timer += dt
+        if self.animation_timer >= self.frame_duration:
+            self.animation_timer = 0
+            self.frame_index = (self.frame_index + 1) % 6
+
+        if self.display_message:
+            self.message_timer -= dt
+            if self.message_timer <= 0:
+                self.display_message = False
+
+    def draw(self, screen, camera_offset, scale=1):
+        frames = self.frames_green if self.activated else self.frames_red
+        frame = frames[self.frame_index]
+        screen.blit(frame, (self.rect.x // scale - camera_offset[0], self.rect.y // scale - camera_offset[1]))
+
+class FinishFlag:
+    def __init__(self, x, y, assets):
+        self.rect = pygame.Rect(x, y, 64, 64)
+        self.frames = assets.frames(FINISH_FLAG_FRAMES)
+        self.frame_index = 0
+        self.animation_timer = 0
+        self.frame_duration = 150  # ms
+
+    def update(self, dt):
+        self.animation_timer += dt
+        if self.animation_timer >= self.frame_duration:
+            self.animation_timer = 0
+            self.frame_index = (self.frame_index + 1) % len(self.frames)
+
+    def draw(self, screen, camera_offset, scale=1):
+        frame = self.frames[self.frame_index]
+        screen.blit(frame, (self.rect.x // scale - camera_offset[0], self.rect.y // scale - camera_offset[1]))
+
+
+
+# --- PLAYER CLASS ---
+class Player:
+    def __init__(self, x, y, assets, collision_grid):
+        self.rect = pygame.Rect(x, y, 29, 64)
+        self.collision_grid = collision_grid
+        self.prev_pos = self.rect.topleft  # position at the start of the current tick (for interpolation)
+        self.vel_x = 0
+        self.vel_y = 0
+        self.on_ground = False
+        self.jump_pressed = False
+        self.coyote_time = 75 # milliseconds of coyote time
+        self.coyote_timer = 0
+        self.input_blocked_until = 0  # Default value
+
+
+        self.dash_power = 12            # speed of dash
+        self.dash_duration = 200        # ms dash lasts
+        self.dash_cooldown = 1000       # ms between dashes
+        self.dashing = False
+        self.dash_timer = 0
+        self.dash_cooldown_timer = 0
+
+
+        # Double jump
+        self.max_jumps = 2
+        self.jumps_remaining = self.max_jumps
+
+        # Load animation frames
+        self.walk_right = assets.frames(PLAYER_WALK_FRAMES)
+        self.walk_left = [assets.flipped(path) for path in PLAYER_WALK_FRAMES]
+
+        self.current_frame = 0
+        self.animation_timer = 0
+        self.frame_duration = 120
+        self.facing_right = True
+        self.image = self.walk_right[0]
+
+    def move(self, keys):
+        self.vel_x = 0
+        if keys[K_a]:
+            self.vel_x = -6
+            self.facing_right = False
+        if keys[K_d]:
+            self.vel_x = 6
+            self.facing_right = True
+
+        # --- Handle jumping (even during dash, to allow canceling dash) ---
+        if keys[K_SPACE]:
+            if not self.jump_pressed and self.jumps_remaining > 0:
+                # Cancel dash if active
+                if self.dashing:
+                    self.dashing = False
+                    self.dash_timer = 0
+
+                if self.jumps_remaining == self.max_jumps:
+                    self.vel_y = JUMP_STRENGTH
+                else:
+                    self.vel_y = JUMP_STRENGTH * 0.6
+
+                self.jumps_remaining -= 1
+                self.jump_pressed = True
+        else:
+            self.jump_pressed = False
+
+        # --- Handle dashing ---
+        if keys[K_LSHIFT]:
+            if not self.dashing and self.dash_cooldown_timer <= 0:
+                self.dashing = True
+                self.dash_timer = self.dash_duration
+                self.dash_cooldown_timer = self.dash_cooldown
+                self.vel_y = 0  # zero vertical movement during dash
+
+    def respawn(self, position):
+        self.rect.x, self.rect.y = position
+        self.prev_pos = self.rect.topleft  # don't interpolate across the teleport
+        self.vel_y = 0
+        self.jumps_remaining = self.max_jumps
+
+    def update(self, dt):
+        self.prev_pos = self.rect.topleft
+
+        # Tick cooldown
+        if self.dash_cooldown_timer > 0:
+            self.dash_cooldown_timer -= dt
+
+        # Tick dash timer
+        if self.dashing:
+            self.dash_timer -= dt
+            if self.dash_timer <= 0:
+                self.dashing = False
+
+        if self.dashing:
+            self.vel_y += GRAVITY * 0.05  # Reduced gravity during dash
+        else:
+            self.vel_y += GRAVITY
+
+
+        # Horizontal movement, resolved in one swept query however far it goes. Rects the
+        # player already overlaps (e.g. a floor block it spawned into) don't block it; the
+        # vertical pass lifts it out of those.
+        if self.dashing:
+            direction = 1 if self.facing_right else -1
+            moved_x, _, hit = self.collision_grid.sweep(self.rect, direction * self.dash_power, 0)
+            if hit is not None:
+                self.dashing = False
+        else:
+            moved_x, _, hit = self.collision_grid.sweep(self.rect, self.vel_x, 0)
+        self.rect.x += moved_x
+
+        # Vertical movement
+        move_y = pixel_round(self.rect.y + self.vel_y) - self.rect.y
+        _, moved_y, hit = self.collision_grid.sweep(self.rect, 0, move_y)
+        self.rect.y += moved_y
+        self.on_ground = False
+        # Decrease coyote timer
+            # Decrease coyote timer if we're not on ground
+        if not self.on_ground:
+            self.coyote_timer -= dt
+
+            # If we’ve fallen off and haven't jumped yet, only allow 1 jump
+            if self.coyote_timer <= 0 and self.jumps_remaining == self.max_jumps:
+                self.jumps_remaining = 1
+        if hit is not None:
+            self.land_or_bump(hit)
+        else:
+            # Not blocked: only push out of a rect the player started inside of (after a respawn)
+            for tile in self.collision_grid.overlapping(self.rect):
+                if self.rect.colliderect(tile):
+                    self.land_or_bump(tile)
+
+        # Animation
+        if self.vel_x != 0:
+            self.animation_timer += dt
+            if self.animation_timer >= self.frame_duration:
+                self.animation_timer = 0
+                self.current_frame = (self.current_frame + 1) % len(self.walk_right)
+        else:
+            self.current_frame = 1
+
+        self.image = self.walk_right[self.current_frame] if self.facing_right else self.walk_left[self.current_frame]
+
+    def land_or_bump(self, tile):
+        if self.vel_y > 0:
+            self.rect.bottom = tile.top
+            self.vel_y = 0
+            self.on_ground = True
+            self.jumps_remaining = self.max_jumps  # reset double jump
+            self.coyote_timer = self.coyote_time # reset coyote time
+        elif self.vel_y < 0:
+            self.rect.top = tile.bottom
+            self.vel_y = 0
+
+    def render_pos(self, alpha):
+        return interpolate(self.prev_pos, self.rect.topleft, alpha)
+
+    def draw(self, screen, camera_offset, alpha=1.0, debug=False, scale=1):
+        # With scale > 1 screen is a buffer scale times smaller than the world, camera_offset
+        # is in buffer pixels and the images are scaled down to match (see ScaledAssets)
+        x, y = self.render_pos(alpha)
+        x, y = x // scale, y // scale
+        draw_x = x - camera_offset[0] - (self.image.get_width() - self.rect.width // scale) // 2
+        draw_y = y - camera_offset[1]
+        screen.blit(self.image, (draw_x, draw_y))
+
+        if debug:
+            pygame.draw.rect(screen, (0, 255, 0), (
+                x - camera_offset[0],
+                y - camera_offset[1],
+                self.rect.width // scale,
+                self.rect.height // scale), 1)
+
+# --- ENEMY MANAGER ---
+# Every enemy lives in one row of a set of packed arrays (position, direction, speed,
+# patrol bounds, animation) instead of in its own object, so a tick moves all of them
+# with a handful of array operations and the player overlap is one vectorized test.
+# Killed enemies are dropped from the arrays on the next update.
+# Given a span, update() only simulates the enemies whose patrol range is near it; the
+# others sleep and are moved to exactly where they would have been when they wake.
+class EnemyManager:
+    def __init__(self, spawns, assets, size=32, speed=1, frame_duration=300, region_width=REGION_WIDTH):
+        # spawns: (x, y, patrol_min_x, patrol_max_x) in pixels per enemy
+        spawns = np.array(spawns, dtype=np.int64).reshape(-1, 4)
+        self.size = size
+        self.frame_duration = frame_duration
+        self.region_width = region_width
+        self.frames = assets.frames(ENEMY_FRAMES)
+        self.x = spawns[:, 0].copy()
+        self.y = spawns[:, 1].copy()
+        self.prev_x = self.x.copy()  # x at the start of the current tick (for interpolation)
+        self.patrol_min = spawns[:, 2].copy()
+        self.patrol_max = spawns[:, 3].copy()
+        self.direction = np.ones(len(spawns), dtype=np.int64)
+        self.speed = np.full(len(spawns), speed, dtype=np.int64)
+        self.animation_timer = np.zeros(len(spawns))
+        self.frame_index = np.zeros(len(spawns), dtype=np.int64)
+        self.alive = np.ones(len(spawns), dtype=bool)
+        self.last_tick = np.zeros(len(spawns), dtype=np.int64)  # ticks simulated per enemy
+        self.ticks = 0
+        self.build_regions()
+
+    def build_regions(self):
+        # Only enemies that start inside their patrol range move predictably enough to sleep
+        self.can_sleep = (self.x >= self.patrol_min) & (self.x <= self.patrol_max)
+        extents = zip(self.patrol_min.tolist(), (self.patrol_max + self.size).tolist())
+        self.regions = RegionIndex(extents, self.region_width)
+        self.always_active = np.flatnonzero(~self.can_sleep)
+        self.active = np.arange(len(self.x))
+        self.active_regions = None  # (first, last) region the active set was built for
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def compact(self):
+        keep = self.alive
+        for name in ("x", "y", "prev_x", "patrol_min", "patrol_max", "direction", "speed",
+                     "animation_timer", "frame_index", "alive", "last_tick"):
+            setattr(self, name, getattr(self, name)[keep])
+        self.build_regions()
+
+    def update(self, dt, span=None):
+        # span: (left, right) pixels to simulate, or None for every enemy
+        if not self.alive.all():
+            self.compact()
+        regions = None if span is None else (span[0] // self.region_width, span[1] // self.region_width)
+        if regions != self.active_regions or span is None:
+            # The camera moved into other regions: rebuild the active set and wake newcomers
+            if span is None:
+                active = np.arange(len(self.x))
+            else:
+                nearby = np.array(self.regions.query(*span), dtype=np.intp)
+                active = np.union1d(nearby, self.always_active) if len(self.always_active) else nearby
+            self.active = active
+            self.active_regions = regions
+            self.wake(active, dt)
+        active = self.active
+
+        x = self.x[active]
+        self.prev_x[active] = x
+        direction = self.direction[active]
+        speed = self.speed[active]
+        x = x + direction * speed
+        # Walked past either end of the patrol range: turn around and step back
+        turned = (x < self.patrol_min[active]) | (x > self.patrol_max[active])
+        direction[turned] *= -1
+        x[turned] += direction[turned] * speed[turned]
+        self.x[active] = x
+        self.direction[active] = direction
+
+        timer = self.animation_timer[active] + dt
+        advanced = timer >= self.frame_duration
+        timer[advanced] = 0
+        self.animation_timer[active] = timer
+        self.frame_index[active[advanced]] = (self.frame_index[active[advanced]] + 1) % len(self.frames)
+
+        self.ticks += 1
+        self.last_tick[active] = self.ticks
+
+    def wake(self, indices, dt):
+        # Catch up enemies that slept through some ticks
+        missed = self.ticks - self.last_tick[indices]
+        sleeping = indices[missed > 0]
+        if not len(sleeping):
+            return
+        missed = missed[missed > 0]
+        self.x[sleeping], self.direction[sleeping] = advance_patrol(
+            self.x[sleeping], self.direction[sleeping], self.speed[sleeping],
+            self.patrol_min[sleeping], self.patrol_max[sleeping], missed)
+        self.animation_timer[sleeping], self.frame_index[sleeping] = advance_animation(
+            self.animation_timer[sleeping], self.frame_index[sleeping], len(self.frames),
+            self.frame_duration, dt, missed)
+        self.last_tick[sleeping] = self.ticks
+
+    def overlapping(self, rect):
+        # Indices of the live, active enemies touching rect, in spawn order
+        size = self.size
+        active = self.active
+        x = self.x[active]
+        y = self.y[active]
+        hits = (self.alive[active] & (x < rect.right) & (x + size > rect.left)
+                & (y < rect.bottom) & (y + size > rect.top))
+        return active[hits].tolist()
+
+    def rect(self, index):
+        return pygame.Rect(int(self.x[index]), int(self.y[index]), self.size, self.size)
+
+    def kill(self, index):
+        self.alive[index] = False
+
+    def draw(self, screen, camera_offset, alpha=1.0, debug=False, scale=1):
+        # Anything in view is within the active span, so only active enemies are considered.
+        # With scale > 1 positions are divided down to the buffer like Player.draw
+        size = self.size // scale
+        view_left, view_top = camera_offset
+        active = self.active
+        x = self.x[active] // scale
+        y = self.y[active] // scale
+        visible = active[self.alive[active]
+                         & (x > view_left - size) & (x < view_left + screen.get_width())
+                         & (y > view_top - size) & (y < view_top + screen.get_height())]
+        if not len(visible):
+            return
+        prev_x = self.prev_x[visible]
+        xs = np.round(prev_x + (self.x[visible] - prev_x) * alpha).astype(np.int64) // scale - view_left
+        ys = self.y[visible] // scale - view_top
+        frames = self.frames
+        screen.blits([(frames[frame], (x, y)) for frame, x, y in zip(self.frame_index[visible].tolist(), xs.tolist(), ys.tolist())], doreturn=False)
+        if debug:
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                pygame.draw.rect(screen, (255, 0, 255), (x, y, size, size), 1)
@@ -0,0 +1,306 @@
+import time
+import pygame
+from pygame.locals import QUIT, KEYDOWN, VIDEOEXPOSE, WINDOWEXPOSED
+from assets import AssetManager, ScaledAssets
+from collision import TileGrid
+from entities import ENTITY_IMAGES
+from config import WIDTH, HEIGHT, TILE_SIZE, TICK_RATE, MAX_CATCH_UP_STEPS, RENDER_FPS, RENDER_SCALE, FRAME_PACING, BACKGROUND_COLOR, \
+    STATIC_RENDER_MODE, SCROLL_REUSE, DIRTY_RECT_UPDATES
+from level import LevelManifest
+from pacing import FramePacer
+from profiler import FrameProfiler, InputLatency
+from rendering import ChunkRenderer, OverlayCache, ScrollingRenderer, TextCache, TileLayerRenderer, TilesetAtlas
+from scenes import HEART_IMAGES, MenuScene, PlayScene
+from timestep import FixedTimestep
+from world import GameWorld
+
+# --- GAME ---
+# The windowed game: display, assets, the scene stack (see scenes.py) and the main loop
+# around a GameWorld.
+# Importing this module has no side effects; pygame is only initialized and the window
+# only opened when a Game is created (see main.py), so the logic modules, level loading
+# and the tools can be imported without any of it.
+class Game:
+    def __init__(self, level_name=None, record_path=None, trace_path="profile_trace.json", show_timing=False,
+                 render_scale=RENDER_SCALE, pacing=FRAME_PACING, pacing_path="frame_pacing.json"):
+        self.startup_start = time.perf_counter()
+        self.render_scale = render_scale
+        self.trace_path = trace_path
+        self.pacing_path = pacing_path
+        self.show_timing = show_timing
+        self.first_frame_ms = None  # ms from creating the Game to the first menu frame on screen
+
+        # Initialize Pygame
+        pygame.init()
+
+        # Screen Setup
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Platformer Game")
+        self.pacer = FramePacer(pacing, RENDER_FPS)
+        self.window_ms = (time.perf_counter() - self.startup_start) * 1000
+
+        # Shared asset registry (every image and font is loaded once)
+        self.assets = AssetManager()
+
+        # --- LOW-RESOLUTION WORLD BUFFER ---
+        # With render_scale > 1 the level and sprites are drawn into a buffer render_scale times
+        # smaller than the window, with images and tiles scaled down to match, and the buffer is
+        # scaled up onto the window in one step; the HUD and menus are drawn over it at full
+        # resolution. Fill and blit cost go down with the buffer's pixel count.
+        if render_scale > 1:
+            self.world_assets = ScaledAssets(self.assets, render_scale)
+            self.world_buffer = pygame.Surface((WIDTH // render_scale, HEIGHT // render_scale)).convert()
+        else:
+            self.world_assets = self.assets
+            self.world_buffer = None
+
+        # Tileset atlases by image path, sliced the first time a level uses them
+        self.tileset_atlases = {}
+
+        self.debug_mode = False  # Set to True for debugging
+        self.scroll_reuse = SCROLL_REUSE
+
+        # Font Setup
+        self.pause_font = self.assets.font("Und_Font_Short.ttf", 36)
+        self.confirm_font = self.assets.font("Und_Font_Short.ttf", 20)
+        self.big_font = self.assets.font("Und_Font_Short.ttf", 72)
+        self.small_font = self.assets.font("Und_Font_Short.ttf", 28)
+        self.message_font = self.assets.font("Und_Font_Short.ttf", 24)
+        self.hud_font = self.assets.sys_font(None, 28)
+
+        # Rendered HUD/menu strings, only re-rendered when the text changes
+        self.text_cache = TextCache()
+
+        # Full-screen menu overlays and fades, created once
+        self.overlays = OverlayCache()
+
+        # Frozen scene under the current static menu (see draw), None while there is none
+        self.static_background = None
+        self.static_scene = None
+        self.static_menu_state = None
+        self.static_rects = []  # screen rects the menu items covered last time they were drawn
+
+        # Frame profiler, shown as an overlay while DEBUG is on
+        self.profiler = FrameProfiler()
+
+        # Time from each frame's event pump to its present, per scene that got the input
+        self.input_latency = InputLatency()
+
+        # Level descriptions (layers, tilesets, spawns); tile data is only loaded when a level is played
+        self.level_manifest = LevelManifest.load()
+        self.start_level = self.level_manifest.get(level_name)
+        self.level_info = None
+
+        # --- BACKGROUND PRELOADING ---
+        # Sprites, tilesets and the first level's tile data load on a worker thread while the main
+        # menu is already showing; the menu converts finished images each frame and only lets the
+        # game start once everything is in.
+        self.preloader = self.assets.preload(
+            [tileset for _, _, tileset in self.start_level.layers] + HEART_IMAGES + ENTITY_IMAGES,
+            [self.start_level],
+        )
+
+        # --- INPUT RECORDER (only with --record) ---
+        self.recorder = None
+        if record_path:
+            from replay import InputRecorder  # only needed while recording
+            self.recorder = InputRecorder(record_path, TICK_RATE, self.start_level.name)
+
+        # --- SCENE STACK ---
+        # The top scene gets the input and is drawn (over the one below it if it is an overlay);
+        # gameplay is one PlayScene that is reused for every level and restart
+        self.timestep = FixedTimestep(TICK_RATE, MAX_CATCH_UP_STEPS)
+        self.play = PlayScene(self)
+        self.scenes = [MenuScene(self)]
+        self.running = False
+
+    def tileset_atlas(self, path):
+        atlas = self.tileset_atlases.get(path)
+        if atlas is None:
+            atlas = self.tileset_atlases[path] = TilesetAtlas(self.world_assets.image(path), TILE_SIZE // self.render_scale)
+        return atlas
+
+    # Game State Variables
+    def reset_full_game_state(self):
+        self.world.reset()
+        self.timestep.reset()  # no leftover frame time from before the (re)start
+        if self.recorder:
+            self.recorder.mark_reset()
+        self.play.reset()
+        self.static_scene = None
+        self.set_debug(False)
+
+    # --- SCENE CHANGES ---
+    def push(self, scene):
+        self.scenes.append(scene)
+
+    def pop(self):
+        self.scenes.pop()
+
+    def start_game(self, level_name=None):
+        # Starts (or restarts) play, on level_name if given, otherwise on the current level
+        if level_name is not None or self.level_info is None:
+            self.load_game_level(level_name or self.start_level.name)
+        self.reset_full_game_state()
+        self.scenes = [self.play]
+
+    def return_to_menu(self):
+        self.reset_full_game_state()
+        self.scenes = [MenuScene(self)]
+
+    def quit(self):
+        self.running = False
+
+    def invalidate(self):
+        # The window was uncovered or restored and its contents may be gone: static menus only
+        # push what changed, so force the next frame to be drawn in full and flipped
+        self.static_scene = None
+        for scene in self.scenes:
+            scene.invalidate()
+
+    def set_debug(self, enabled):
+        self.debug_mode = enabled
+        self.profiler.set_enabled(enabled)
+
+    def load_game_level(self, name):
+        # Builds the collision grid, world and static renderer of a level, dropping the previous level's tile data
+        if self.level_info is not None:
+            self.level_info.unload()
+        level_info = self.level_info = self.level_manifest.get(name)
+        layers = level_info.load_layers()
+
+        # --- COLLISION GRID (used by Player.update instead of scanning every tile) ---
+        self.collision_grid = TileGrid(layers[level_info.collision_layer], TILE_SIZE)
+
+        # --- GAME WORLD (player, enemies, checkpoints and the simulation tick) ---
+        self.world = GameWorld(self.world_assets, self.collision_grid, level_info.player_start, level_info.checkpoints,
+                               level_info.finish_flag, level_info.enemies)
+
+        # --- STATIC LAYER RENDERER (only on-screen chunks/tiles are drawn) ---
+        static_layers = [(layers[layer_name], self.tileset_atlas(tileset).get) for layer_name, _, tileset in level_info.layers]
+        tile_size = TILE_SIZE // self.render_scale
+        if STATIC_RENDER_MODE in ("streaming", "chunks"):
+            self.static_renderer = ChunkRenderer(static_layers, tile_size, streaming=STATIC_RENDER_MODE == "streaming")
+        else:
+            self.static_renderer = TileLayerRenderer(static_layers, tile_size, batched=STATIC_RENDER_MODE == "batched")
+        if self.scroll_reuse:
+            self.static_renderer = ScrollingRenderer(self.static_renderer, BACKGROUND_COLOR)
+
+    def run(self):
+        self.running = True
+        try:
+            while self.running:
+                self.frame()
+        finally:
+            if self.recorder:
+                self.recorder.close()
+                if self.show_timing:
+                    print(f"Recording: {self.recorder.ticks} ticks written to {self.recorder.path}")
+            if self.show_timing:
+                print(f"Assets: {len(self.assets.load_times)} loaded in {self.assets.total_load_time() * 1000:.1f} ms")
+                for key, load_ms in self.assets.timing_report():
+                    print(f"  {load_ms:8.2f} ms  {key}")
+                for line in self.input_latency.report_lines() + self.pacer.debug_lines():
+                    print(line)
+                print(f"Simulation: {self.timestep.dropped_ms:.0f} ms of frame time dropped after falling behind")
+        pygame.quit()
+
+    # --- MAIN LOOP ---
+    def frame(self):
+        dt = self.pacer.wait()
+        profiler = self.profiler
+
+        # The one event pump of the frame: every event goes to whichever scene is on top when
+        # it is handled, so events after a scene change reach the new scene
+        profiler.begin("input")
+        pumped = time.perf_counter()
+        input_scene = None  # the scene that got the frame's first key press
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                self.quit()
+                continue
+            if event.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+                self.invalidate()
+                continue
+            scene = self.scenes[-1]
+            if event.type == KEYDOWN and input_scene is None:
+                input_scene = scene.name
+            scene.handle_event(event)
+        profiler.end("input")
+        if not self.running:
+            return
+
+        # The top scene updates, and the scenes below it for as long as the ones above let them
+        profiler.begin("update")
+        first = len(self.scenes) - 1
+        while first > 0 and not self.scenes[first].pauses_below:
+            first -= 1
+        for scene in self.scenes[first:]:
+            scene.update(dt)
+        profiler.end("update")
+        if not self.running:
+            return
+
+        if self.draw(dt) and input_scene is not None:
+            self.input_latency.record(input_scene, (time.perf_counter() - pumped) * 1000)
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.startup_start) * 1000
+            if self.show_timing:
+                print(f"Startup: window after {self.window_ms:.1f} ms, first menu frame after {self.first_frame_ms:.1f} ms")
+        profiler.end_frame(dt)
+
+    def draw(self, dt):
+        # Draws and presents the top scene; returns whether anything reached the display
+        screen, profiler = self.screen, self.profiler
+        top = self.scenes[-1]
+        if not top.overlay:
+            self.static_scene = None
+            return self.present(top.draw(screen, dt))
+
+        # --- STATIC SCENES ---
+        # While a menu is shown over a frozen scene, the scene with its dimming overlay is kept
+        # from the first frame and only the menu items that changed are restored, redrawn and
+        # pushed with display.update(); a frame where nothing changed draws nothing at all.
+        # The debug overlay updates every frame, so it always takes the full redraw.
+        static = DIRTY_RECT_UPDATES and not self.debug_mode and top.is_static()
+        if static and self.static_scene is top:
+            profiler.begin("draw_menus")
+            rects = []
+            menu_state = top.menu_state()
+            if menu_state != self.static_menu_state:
+                for rect in self.static_rects:
+                    screen.blit(self.static_background, rect, rect)
+                rects = top.draw_items(screen)
+                rects, self.static_rects = self.static_rects + rects, rects
+                self.static_menu_state = menu_state
+            profiler.end("draw_menus")
+            return self.present(rects)
+
+        # Full redraw: the nearest non-overlay scene below, then this menu over it
+        self.static_scene = None
+        base = next(scene for scene in reversed(self.scenes) if not scene.overlay)
+        base.draw(screen, dt)
+        profiler.begin("draw_menus")
+        top.draw_overlay(screen)
+        if static:
+            self.static_background = screen.copy()
+            self.static_scene = top
+            self.static_menu_state = top.menu_state()
+        self.static_rects = top.draw_items(screen)
+        profiler.end("draw_menus")
+        return self.present(True)
+
+    def present(self, changed):
+        # changed: True to flip the whole frame, otherwise the list of changed rects
+        if changed is True:
+            if self.debug_mode:
+                lines = self.play.debug_lines() + self.pacer.debug_lines() + self.text_cache.debug_lines()
+                self.profiler.draw(self.screen, self.hud_font, self.text_cache, lines)
+            self.profiler.begin("flip")
+            pygame.display.flip()
+            self.profiler.end("flip")
+            return True
+        if changed:
+            pygame.display.update(changed)
+            return True
+        return False
@@ -0,0 +1,114 @@
+import argparse
+import time
+import pygame.locals
+from pygame.locals import K_LSHIFT
+from assets import AssetManager
+from collision import TileGrid
+from config import TILE_SIZE, TICK_RATE
+from level import LevelManifest
+from world import GameWorld
+
+# --- HEADLESS SIMULATION ---
+# Runs GameWorld ticks against a loaded tile map with no window and no video surface,
+# driven by a scripted input instead of pygame.key.get_pressed().
+
+# Script key names: every pygame K_ constant without the prefix ("a", "space", "lshift",
+# "escape", ...), looked up here instead of pygame.key.key_code(), which needs pygame.init()
+KEY_NAMES = {name[2:].lower(): code for name, code in vars(pygame.locals).items() if name.startswith("K_")}
+KEY_NAMES["shift"] = K_LSHIFT
+
+# Default traversal: run right, jump every 45 ticks and dash every 120 ticks
+DEFAULT_SCRIPT = """
+# from_tick to_tick keys... [every N]
+0 1000000 d
+0 5 space every 45
+0 1 shift every 120
+"""
+
+
+# Stands in for the sequence returned by pygame.key.get_pressed()
+class ScriptedKeys:
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class InputScript:
+    def __init__(self, entries):
+        self.entries = entries  # (from_tick, to_tick, key codes, period or None)
+
+    @classmethod
+    def parse(cls, text):
+        entries = []
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].split()
+            if not line:
+                continue
+            period = None
+            if len(line) > 2 and line[-2] == "every":
+                period = int(line[-1])
+                line = line[:-2]
+            unknown = [name for name in line[2:] if name.lower() not in KEY_NAMES]
+            if unknown:
+                raise ValueError(f"unknown key {unknown[0]!r} in input script line {' '.join(line)!r}")
+            keys = frozenset(KEY_NAMES[name.lower()] for name in line[2:])
+            entries.append((int(line[0]), int(line[1]), keys, period))
+        return cls(entries)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as script_file:
+            return cls.parse(script_file.read())
+
+    def keys_at(self, tick):
+        pressed = set()
+        for from_tick, to_tick, keys, period in self.entries:
+            t = tick % period if period else tick
+            if from_tick <= t < to_tick:
+                pressed |= keys
+        return ScriptedKeys(pressed)
+
+
+def create_headless_world(level_name=None):
+    # level_name: a level from levels.json (or its collision CSV), None for the default level
+    level = LevelManifest.load().get(level_name)
+    assets = AssetManager(convert=False)
+    collision_grid = TileGrid(level.load_layers()[level.collision_layer], TILE_SIZE)
+    return GameWorld(assets, collision_grid, level.player_start, level.checkpoints, level.finish_flag, level.enemies)
+
+
+def run_headless(world, script, ticks, stop_on_end=True):
+    # Returns the number of ticks simulated
+    dt = 1000 / TICK_RATE
+    for tick in range(ticks):
+        world.tick(script.keys_at(tick), dt)
+        if stop_on_end and (world.finished_game or world.show_game_over):
+            return tick + 1
+    return ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game logic without a display.")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--script", help="input script file (default: run right, jump and dash)")
+    parser.add_argument("--level", help="level from levels.json (default: the manifest's default level)")
+    parser.add_argument("--no-stop", action="store_true", help="keep simulating after winning or game over")
+    args = parser.parse_args()
+
+    script = InputScript.load(args.script) if args.script else InputScript.parse(DEFAULT_SCRIPT)
+    world = create_headless_world(args.level)
+
+    start = time.perf_counter()
+    ticks = run_headless(world, script, args.ticks, stop_on_end=not args.no_stop)
+    elapsed = time.perf_counter() - start
+
+    player = world.player
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / elapsed:.0f} ticks/s)")
+    print(f"player at {player.rect.topleft}, lives {world.player_lives}, kills {world.kill_count}, "
+          f"finished {world.finished_game}, game over {world.show_game_over}")
+
+
+if __name__ == "__main__":
+    main()
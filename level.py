@@ -0,0 +1,226 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import numpy as np
+
+# Tile Map Loaders
+# Layers are 2D NumPy arrays indexed [row, col] (tile_map[row][col] still works); -1 is an empty cell
+def load_tile_map(csv_path):
+    with open(csv_path, newline='') as csvfile:
+        cells = np.array([line.split(",") for line in csvfile.read().splitlines() if line.strip()])
+    cells = np.char.strip(cells)
+    is_tile = np.char.isdigit(cells)  # anything that isn't a plain tile id counts as empty
+    tile_map = np.full(cells.shape, -1, dtype=np.int64)
+    tile_map[is_tile] = cells[is_tile].astype(np.int64)
+    return tile_map
+
+
+# --- DERIVED LAYER DATA (vectorized) ---
+def solid_mask(tile_map, solid_borders=True):
+    # True for every cell the player collides with; the first and last column are map borders
+    mask = np.asarray(tile_map) != -1
+    if solid_borders and mask.shape[1]:
+        mask[:, 0] = True
+        mask[:, -1] = True
+    return mask
+
+
+def occupied_cells(tile_map):
+    # (rows, cols, tile ids) of every non-empty cell, in row-major order
+    tile_map = np.asarray(tile_map)
+    rows, cols = np.nonzero(tile_map != -1)
+    return rows, cols, tile_map[rows, cols]
+
+
+def chunk_occupancy(tile_map, chunk_size):
+    # [chunk_row, chunk_col] -> True if the chunk has at least one tile
+    filled = np.asarray(tile_map) != -1
+    height, width = filled.shape
+    chunks_y = -(-height // chunk_size)
+    chunks_x = -(-width // chunk_size)
+    padded = np.zeros((chunks_y * chunk_size, chunks_x * chunk_size), dtype=bool)
+    padded[:height, :width] = filled
+    return padded.reshape(chunks_y, chunk_size, chunks_x, chunk_size).any(axis=(1, 3))
+
+
+# --- COMPILED LEVEL FORMAT ---
+# A compiled level is a small header, a table of layer names with the CSV each layer was
+# compiled from, and then every layer as a packed little-endian int16 array (row-major,
+# -1 = empty). Loading memory-maps the file and returns each layer as an int16 array view
+# on the mapped file, so there are no per-cell Python objects.
+LEVEL_MAGIC = b"PLVL"
+LEVEL_VERSION = 2
+LEVEL_HEADER = struct.Struct("<4sHHHH")  # magic, version, width, height, layer count
+LAYER_NAME = struct.Struct("<16s")
+LAYER_SOURCE = struct.Struct("<H")  # byte length of the layer's UTF-8 source path, which follows it
+
+def compile_level(output_path, layer_paths):
+    # layer_paths: {layer name: Tiled CSV export}; every layer must have the same size
+    layers = {name: load_tile_map(path) for name, path in layer_paths.items()}
+    height, width = next(iter(layers.values())).shape
+    for name, tile_map in layers.items():
+        if tile_map.shape != (height, width):
+            raise ValueError(f"layer {name!r} is not {width}x{height} tiles")
+        if tile_map.size and tile_map.max() > 32767:
+            raise ValueError(f"layer {name!r} has a tile id that does not fit in int16")
+        if len(name.encode("ascii")) > LAYER_NAME.size:
+            raise ValueError(f"layer name {name!r} is longer than {LAYER_NAME.size} bytes")
+
+    table = b""
+    for name, path in layer_paths.items():
+        source = path.encode("utf-8")
+        table += LAYER_NAME.pack(name.encode("ascii")) + LAYER_SOURCE.pack(len(source)) + source
+    table += b"\0" * (len(table) % 2)  # keeps the int16 cells 2-byte aligned
+
+    # Written to a temporary file next to the output and renamed over it, so a reader (the
+    # preloader, another instance) never maps a half-written file
+    temp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as level_file:
+            level_file.write(LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, width, height, len(layers)))
+            level_file.write(table)
+            for tile_map in layers.values():
+                level_file.write(tile_map.astype("<i2").tobytes())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_header(data, path):
+    # Returns (width, height, [(layer name, source path)], offset of the first cell)
+    magic, version, width, height, layer_count = LEVEL_HEADER.unpack_from(data)
+    if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+        raise ValueError(f"{path} is not a version {LEVEL_VERSION} compiled level")
+    offset = LEVEL_HEADER.size
+    layers = []
+    for _ in range(layer_count):
+        name = LAYER_NAME.unpack_from(data, offset)[0].rstrip(b"\0").decode("ascii")
+        offset += LAYER_NAME.size
+        length = LAYER_SOURCE.unpack_from(data, offset)[0]
+        offset += LAYER_SOURCE.size
+        layers.append((name, bytes(data[offset:offset + length]).decode("utf-8")))
+        offset += length
+    return width, height, layers, offset + offset % 2
+
+
+def load_level(path):
+    # Returns {layer name: read-only int16 array of shape (height, width)}
+    with open(path, "rb") as level_file:
+        data = mmap.mmap(level_file.fileno(), 0, access=mmap.ACCESS_READ)
+    width, height, layers, offset = read_header(data, path)
+    cells = np.frombuffer(data, dtype="<i2", count=len(layers) * width * height, offset=offset)
+    cells = cells.reshape(len(layers), height, width)
+    return {name: cells[index] for index, (name, _) in enumerate(layers)}
+
+
+def compiled_sources(path):
+    # {layer name: source CSV} a compiled level was built from, None if it can't be read
+    # (missing, truncated or from an older version of the format)
+    try:
+        with open(path, "rb") as level_file, mmap.mmap(level_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return dict(read_header(data, path)[2])
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def load_compiled(binary_path, layer_paths):
+    # Memory-maps a compiled level, compiling it first if it is missing, older than its CSVs
+    # or was compiled from different layers or CSVs than layer_paths (levels.json changed)
+    sources = list(layer_paths.values())
+    if (not os.path.exists(binary_path)
+            or os.path.getmtime(binary_path) < max(os.path.getmtime(path) for path in sources)
+            or list((compiled_sources(binary_path) or {}).items()) != list(layer_paths.items())):
+        try:
+            compile_level(binary_path, layer_paths)
+        except OSError:
+            return {name: load_tile_map(path) for name, path in layer_paths.items()}  # read-only checkout
+    return load_level(binary_path)
+
+
+# --- LEVEL MANIFEST ---
+# levels.json describes every level: its tile layers in draw order (Tiled CSV + tileset
+# image), the layer the player collides with, the player start, checkpoint and finish flag
+# positions in pixels, enemies as (tile_x, tile_y, patrol_start_x, patrol_end_x) in tiles,
+# and optionally the level that follows it. Reading the manifest loads no tile data; a
+# level's layers are compiled/memory-mapped the first time they are asked for.
+LEVEL_MANIFEST = "levels.json"
+
+
+class LevelInfo:
+    def __init__(self, name, data):
+        self.name = name
+        self.layers = [(layer["name"], layer["csv"], layer["tileset"]) for layer in data["layers"]]
+        self.collision_layer = data.get("collision_layer", "structure")
+        self.player_start = tuple(data["player_start"])
+        self.checkpoints = [tuple(position) for position in data.get("checkpoints", [])]
+        self.finish_flag = tuple(data["finish_flag"])
+        self.enemies = [tuple(enemy) for enemy in data.get("enemies", [])]
+        self.next_level = data.get("next")
+        self.tile_layers = None
+        self.lock = threading.Lock()  # layers may be loaded by a preloading thread
+
+    @property
+    def layer_paths(self):
+        return {name: csv_path for name, csv_path, _ in self.layers}
+
+    @property
+    def binary_path(self):
+        return f"{self.name}.lvl"
+
+    def load_layers(self):
+        # {layer name: tile array}, loaded on first use and kept until unload()
+        with self.lock:
+            if self.tile_layers is None:
+                self.tile_layers = load_compiled(self.binary_path, self.layer_paths)
+            return self.tile_layers
+
+    def unload(self):
+        self.tile_layers = None
+
+
+class LevelManifest:
+    def __init__(self, levels, default):
+        self.levels = levels
+        self.default = default
+
+    @classmethod
+    def load(cls, path=LEVEL_MANIFEST):
+        with open(path) as manifest_file:
+            data = json.load(manifest_file)
+        levels = {name: LevelInfo(name, level) for name, level in data["levels"].items()}
+        return cls(levels, data.get("default", next(iter(levels))))
+
+    def get(self, name=None):
+        # A level by name (default level for None); a collision layer CSV path also works,
+        # which is how recordings made before the manifest name their level
+        name = name or self.default
+        if name in self.levels:
+            return self.levels[name]
+        for level in self.levels.values():
+            if level.layer_paths[level.collision_layer] == name:
+                return level
+        raise KeyError(f"no level {name!r} in the manifest")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile Tiled CSV layers into a binary level file.")
+    parser.add_argument("output", help="compiled level file to write")
+    parser.add_argument("layers", nargs="*", metavar="NAME=CSV",
+                        help="layers to include (default: the layers of the manifest's default level)")
+    args = parser.parse_args()
+
+    if args.layers:
+        layer_paths = dict(layer.split("=", 1) for layer in args.layers)
+    else:
+        layer_paths = LevelManifest.load().get().layer_paths
+    compile_level(args.output, layer_paths)
+    print(f"wrote {args.output} ({os.path.getsize(args.output)} bytes, layers: {', '.join(layer_paths)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import json
+import math
+import os
+import time
+from collections import deque
+import pygame
+from config import RENDER_FPS, FRAME_PACING, PACING_MODES
+
+# --- FRAME PACING ---
+# Waits out the rest of each frame in one of the PACING_MODES and records, per frame, how long
+# it really took and how late the wait returned:
+#   "sleep"           Clock.tick: sleeps, wakes with the OS timer's granularity (often 1-15 ms late)
+#   "hybrid"          sleeps until spin_ms before the deadline, then spins on perf_counter for the rest
+#   "tick_busy_loop"  Clock.tick_busy_loop: spins for the whole wait (precise, one core busy)
+#   "uncapped"        no wait at all
+# Clock waits one frame from when its previous wait returned, so every late wake-up makes
+# the frame longer; hybrid puts its deadlines one frame after the previous deadline instead,
+# so a late wake-up is made up on the next frame.
+class FramePacer:
+    def __init__(self, mode=FRAME_PACING, fps=RENDER_FPS, spin_ms=2.0, history=600):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.frame_ms = 1000 / fps if fps else 0.0
+        self.spin_ms = spin_ms
+        self.intervals = deque(maxlen=history)  # ms from one frame's wait to the next
+        self.lateness = deque(maxlen=history)   # ms the wait returned after its deadline
+        self.mode = mode
+        self.reset()
+
+    def set_mode(self, mode):
+        # Switching modes starts the statistics over, so each mode is measured on its own
+        self.mode = mode
+        self.reset()
+
+    def next_mode(self):
+        self.set_mode(PACING_MODES[(PACING_MODES.index(self.mode) + 1) % len(PACING_MODES)])
+
+    def reset(self):
+        self.intervals.clear()
+        self.lateness.clear()
+        self.last = None      # perf_counter when the previous wait returned
+        self.deadline = None  # perf_counter the next wait should return at
+
+    def wait(self):
+        # Call once per frame in place of Clock.tick; returns the ms since the previous call
+        mode, fps = self.mode, self.fps
+        if mode == "sleep":
+            dt = self.clock.tick(fps)
+        elif mode == "tick_busy_loop":
+            dt = self.clock.tick_busy_loop(fps)
+        elif mode == "uncapped":
+            dt = self.clock.tick()
+        else:
+            dt = None
+            if self.deadline is not None and fps:
+                remaining = self.deadline - time.perf_counter()
+                if remaining * 1000 > self.spin_ms:
+                    time.sleep(remaining - self.spin_ms / 1000)
+                while time.perf_counter() < self.deadline:
+                    pass
+            self.clock.tick()  # keeps the clock's last tick current for a later switch back
+
+        now = time.perf_counter()
+        if self.last is not None:
+            interval = (now - self.last) * 1000
+            self.intervals.append(interval)
+            if self.deadline is not None and mode != "uncapped":
+                self.lateness.append(max(0.0, (now - self.deadline) * 1000))
+            if dt is None:
+                dt = interval
+        elif dt is None:
+            dt = 0.0
+        self.last = now
+
+        if self.frame_ms:
+            frame_seconds = self.frame_ms / 1000
+            if mode == "hybrid" and self.deadline is not None and now - self.deadline <= frame_seconds:
+                self.deadline += frame_seconds
+            else:
+                self.deadline = now + frame_seconds  # what Clock aims for, and hybrid after falling a frame behind
+        return dt
+
+    def summary(self):
+        # Statistics over the recent history, None before the second frame
+        intervals = sorted(self.intervals)
+        if not intervals:
+            return None
+        frames = len(intervals)
+        mean = sum(intervals) / frames
+        lateness = self.lateness
+        # A missed frame was on screen for (at least) two frame periods
+        missed = sum(interval > self.frame_ms * 1.5 for interval in intervals) if self.frame_ms else 0
+        return {
+            "mode": self.mode,
+            "target_fps": self.fps,
+            "frames": frames,
+            "fps": 1000 / mean if mean else 0.0,
+            "mean_ms": mean,
+            "jitter_ms": math.sqrt(sum((interval - mean) ** 2 for interval in intervals) / frames),
+            "p99_ms": intervals[min(frames - 1, int(round(0.99 * (frames - 1))))],
+            "max_ms": intervals[-1],
+            "missed": missed,
+            "late_mean_ms": sum(lateness) / len(lateness) if lateness else 0.0,
+            "late_max_ms": max(lateness) if lateness else 0.0,
+        }
+
+    def debug_lines(self):
+        stats = self.summary()
+        if stats is None:
+            return [f"pacing {self.mode}"]
+        return [
+            f"{self.mode} {stats['fps']:.0f} fps  missed {stats['missed']}",
+            f"jitter {stats['jitter_ms']:.1f}  p99 {stats['p99_ms']:.1f}  late {stats['late_mean_ms']:.1f}",
+        ]
+
+    def dump(self, path):
+        # The summary and every recorded frame, as JSON
+        with open(path, "w") as stats_file:
+            json.dump({"summary": self.summary(), "frame_ms": list(self.intervals), "late_ms": list(self.lateness)},
+                      stats_file, indent=2)
+        return os.path.abspath(path)
@@ -0,0 +1,122 @@
+import json
+import os
+import time
+from collections import deque
+import pygame
+
+# --- FRAME PROFILER ---
+# Named begin()/end() timing scopes around the stages of the game loop, a rolling
+# frame-time history and an overlay that shows both. While disabled every call returns
+# straight away, so the instrumentation can stay in the loop permanently.
+class FrameProfiler:
+    def __init__(self, history=240, trace_frames=600):
+        self.enabled = False
+        self.frame_times = deque(maxlen=history)   # ms per frame
+        self.scope_order = []                       # scopes in the order they ran last frame
+        self.scope_ms = {}                          # smoothed ms per scope
+        self.started = {}
+        self.current = {}
+        self.current_starts = {}
+        self.trace_events = deque(maxlen=trace_frames * 16)  # Chrome trace events of the last frames
+        self.origin = time.perf_counter()
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            self.frame_times.clear()
+            self.scope_ms.clear()
+            self.started.clear()
+            self.current.clear()
+            self.current_starts.clear()
+        self.enabled = enabled
+
+    def begin(self, name):
+        if not self.enabled:
+            return
+        self.started[name] = time.perf_counter()
+
+    def end(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        start = self.started.pop(name, None)
+        if start is None:
+            return
+        self.current[name] = self.current.get(name, 0.0) + (now - start) * 1000
+        self.current_starts.setdefault(name, start)
+        self.trace_events.append({"name": name, "ph": "X", "pid": 0, "tid": 0,
+                                  "ts": (start - self.origin) * 1e6, "dur": (now - start) * 1e6})
+
+    def end_frame(self, frame_ms):
+        if not self.enabled:
+            return
+        self.frame_times.append(frame_ms)
+        for name in self.current_starts:
+            if name not in self.scope_ms:
+                self.scope_ms[name] = self.current[name]
+        self.scope_order = sorted(self.current_starts, key=self.current_starts.get)
+        for name in self.scope_order:
+            self.scope_ms[name] = self.scope_ms[name] * 0.9 + self.current[name] * 0.1
+        self.current.clear()
+        self.current_starts.clear()
+
+    def dump_trace(self, path):
+        # Chrome trace event format (open in chrome://tracing or Perfetto)
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": list(self.trace_events), "displayTimeUnit": "ms"}, trace_file)
+        return os.path.abspath(path)
+
+    def draw(self, screen, font, text_cache, extra_lines=(), budget_ms=1000 / 60):
+        if not self.enabled:
+            return
+        width, graph_height = 300, 60
+        lines = []
+        if self.frame_times:
+            average = sum(self.frame_times) / len(self.frame_times)
+            lines.append(f"frame {average:.1f} ms  ({1000 / average if average else 0:.0f} fps)")
+        lines += [f"{name:<12}{self.scope_ms[name]:6.2f} ms" for name in self.scope_order if name in self.scope_ms]
+        lines += list(extra_lines)
+
+        line_height = font.get_linesize()
+        panel = pygame.Rect(screen.get_width() - width - 10, 40, width, graph_height + 12 + line_height * len(lines))
+        screen.fill((0, 0, 0), panel)
+
+        # Rolling frame-time graph, the yellow line is the frame budget
+        graph_bottom = panel.y + 6 + graph_height
+        scale = graph_height / (budget_ms * 2)
+        for i, frame_ms in enumerate(self.frame_times):
+            bar = min(graph_height, int(frame_ms * scale))
+            color = (0, 200, 0) if frame_ms <= budget_ms else (220, 0, 0)
+            x = panel.right - len(self.frame_times) + i
+            pygame.draw.line(screen, color, (x, graph_bottom), (x, graph_bottom - bar))
+        budget_y = graph_bottom - int(budget_ms * scale)
+        pygame.draw.line(screen, (255, 255, 0), (panel.x, budget_y), (panel.right - 1, budget_y))
+
+        y = graph_bottom + 6
+        for line in lines:
+            screen.blit(text_cache.render(font, line, True, (255, 255, 255)), (panel.x + 6, y))
+            y += line_height
+
+
+# --- INPUT LATENCY ---
+# Time from the event pump that delivered a key press to the end of the present that shows
+# its result, per scene that handled it. pygame events carry no timestamp, so the time a
+# press waited in the queue before the pump (at most one frame) is not included.
+class InputLatency:
+    def __init__(self, history=240):
+        self.history = history
+        self.samples = {}  # scene name -> deque of ms
+
+    def record(self, scene_name, latency_ms):
+        samples = self.samples.get(scene_name)
+        if samples is None:
+            samples = self.samples[scene_name] = deque(maxlen=self.history)
+        samples.append(latency_ms)
+
+    def summary(self):
+        # scene name -> (presses, mean ms, max ms) over the recent history
+        return {name: (len(samples), sum(samples) / len(samples), max(samples))
+                for name, samples in self.samples.items() if samples}
+
+    def report_lines(self):
+        return [f"input->present {name:<10}{mean:6.2f} ms avg {worst:6.2f} ms max ({count} presses)"
+                for name, (count, mean, worst) in self.summary().items()]
@@ -0,0 +1,287 @@
+from collections import OrderedDict
+import numpy as np
+import pygame
+from level import chunk_occupancy, occupied_cells
+
+# --- TILESET ATLAS ---
+# Slices a tileset once at load into display-format tile surfaces indexed by tile id,
+# so drawing a tile is a list lookup instead of a new subsurface every time.
+class TilesetAtlas:
+    def __init__(self, tileset, tile_size):
+        self.tile_size = tile_size
+        tiles_per_row = tileset.get_width() // tile_size
+        tile_rows = tileset.get_height() // tile_size
+        self.tiles = []
+        for tile_id in range(tiles_per_row * tile_rows):
+            tile_x = (tile_id % tiles_per_row) * tile_size
+            tile_y = (tile_id // tiles_per_row) * tile_size
+            self.tiles.append(tileset.subsurface(pygame.Rect(tile_x, tile_y, tile_size, tile_size)).convert_alpha())
+        self.count = len(self.tiles)
+
+    def get(self, tile_id):
+        # None for empty cells (-1), map borders (-999) and ids outside the tileset
+        if 0 <= tile_id < self.count:
+            return self.tiles[tile_id]
+        return None
+
+# --- CHUNKED STATIC LAYER RENDERER ---
+# The static layers never change, so they are composited once into chunk surfaces of
+# chunk_size x chunk_size tiles. Each frame only the chunks that intersect the viewport
+# are blitted, so draw cost follows screen size, not level length.
+# By default every chunk is baked at load time. With streaming=True nothing is baked up
+# front: chunks are baked as the camera approaches them (up to bakes_per_frame chunks a
+# frame, prefetch chunk columns ahead of the view) and dropped again once they are more
+# than keep chunk columns behind it, so memory stays bounded however long the level is.
+class ChunkRenderer:
+    def __init__(self, layers, tile_size, chunk_size=16, streaming=False, prefetch=2, keep=3, bakes_per_frame=1):
+        # layers: list of (tile_map, lookup) drawn in order, lookup(tile_id) -> Surface or None
+        # (normally TilesetAtlas.get)
+        self.tile_size = tile_size
+        self.chunk_size = chunk_size
+        self.chunk_pixels = tile_size * chunk_size
+        self.layers = [(np.asarray(tile_map), lookup) for tile_map, lookup in layers]
+        self.chunks_y = max(-(-tile_map.shape[0] // chunk_size) for tile_map, _ in self.layers)
+        self.chunks_x = max(-(-tile_map.shape[1] // chunk_size) for tile_map, _ in self.layers)
+        self.streaming = streaming
+        self.prefetch = prefetch
+        self.keep = keep
+        self.bakes_per_frame = bakes_per_frame
+
+        # Chunks where any layer has a tile; all other chunks are skipped without looking at a cell
+        self.occupied = np.zeros((self.chunks_y, self.chunks_x), dtype=bool)
+        for tile_map, _ in self.layers:
+            layer_occupancy = chunk_occupancy(tile_map, chunk_size)
+            self.occupied[:layer_occupancy.shape[0], :layer_occupancy.shape[1]] |= layer_occupancy
+
+        self.chunks = {}  # (chunk_x, chunk_y) -> baked Surface, or None if it has nothing to draw
+        self.last_span = None
+        self.direction = 1  # which way the camera last moved, prefetching favours that side
+        if not streaming:
+            for chunk_y, chunk_x in zip(*np.nonzero(self.occupied)):
+                self.chunks[int(chunk_x), int(chunk_y)] = self.bake_chunk(int(chunk_x), int(chunk_y))
+
+    def bake_chunk(self, chunk_x, chunk_y):
+        surface = None
+        first_col = chunk_x * self.chunk_size
+        first_row = chunk_y * self.chunk_size
+        for tile_map, lookup in self.layers:
+            block = tile_map[first_row:first_row + self.chunk_size, first_col:first_col + self.chunk_size]
+            rows, cols, tile_ids = occupied_cells(block)
+            for row, col, tile_id in zip(rows.tolist(), cols.tolist(), tile_ids.tolist()):
+                texture = lookup(tile_id)
+                if texture is None:
+                    continue
+                if surface is None:
+                    surface = pygame.Surface((self.chunk_pixels, self.chunk_pixels), pygame.SRCALPHA).convert_alpha()
+                surface.blit(texture, (col * self.tile_size, row * self.tile_size))
+        return surface  # None for chunks with nothing to draw
+
+    def ensure_chunk(self, chunk_x, chunk_y):
+        # Baked surface of a chunk, baking it now if it was never baked or was evicted
+        key = (chunk_x, chunk_y)
+        if key not in self.chunks:
+            self.chunks[key] = self.bake_chunk(chunk_x, chunk_y) if self.occupied[chunk_y, chunk_x] else None
+        return self.chunks[key]
+
+    def visible_chunks(self, camera_offset, view_width, view_height):
+        # Inclusive chunk span that intersects the viewport
+        size = self.chunk_pixels
+        left = max(0, camera_offset[0] // size)
+        right = min(self.chunks_x - 1, (camera_offset[0] + view_width - 1) // size)
+        top = max(0, camera_offset[1] // size)
+        bottom = min(self.chunks_y - 1, (camera_offset[1] + view_height - 1) // size)
+        return left, right, top, bottom
+
+    def stream(self, left, right):
+        # Prefetch a few chunks next to the view (the side the camera is moving to first)
+        # and evict the ones that fell too far behind
+        if self.last_span is not None and left != self.last_span[0]:
+            self.direction = 1 if left > self.last_span[0] else -1
+        if self.last_span != (left, right):
+            self.last_span = (left, right)
+            for key in [key for key in self.chunks if not left - self.keep <= key[0] <= right + self.keep]:
+                del self.chunks[key]
+
+        ahead = range(right + 1, right + self.prefetch + 1)
+        behind = range(left - 1, left - self.prefetch - 1, -1)
+        columns = list(ahead) + list(behind) if self.direction > 0 else list(behind) + list(ahead)
+        budget = self.bakes_per_frame
+        for chunk_x in columns:
+            if not 0 <= chunk_x < self.chunks_x:
+                continue
+            for chunk_y in range(self.chunks_y):
+                if (chunk_x, chunk_y) not in self.chunks:
+                    if budget == 0:
+                        return
+                    self.ensure_chunk(chunk_x, chunk_y)
+                    if self.occupied[chunk_y, chunk_x]:
+                        budget -= 1
+
+    def draw(self, screen, camera_offset, stream=True):
+        # stream=False skips chunk streaming, for callers that draw only part of the view and
+        # stream for the whole view themselves (see ScrollingRenderer)
+        left, right, top, bottom = self.visible_chunks(camera_offset, screen.get_width(), screen.get_height())
+        size = self.chunk_pixels
+        for chunk_y in range(top, bottom + 1):
+            for chunk_x in range(left, right + 1):
+                surface = self.ensure_chunk(chunk_x, chunk_y)
+                if surface is not None:
+                    screen.blit(surface, (chunk_x * size - camera_offset[0], chunk_y * size - camera_offset[1]))
+        if self.streaming and stream:
+            self.stream(left, right)
+
+    def memory_bytes(self):
+        # Pixel memory held by the baked chunks
+        return sum(surface.get_bytesize() * self.chunk_pixels * self.chunk_pixels
+                   for surface in self.chunks.values() if surface is not None)
+
+
+# --- CULLED TILE LAYER RENDERER ---
+# Draws the visible tiles of each layer every frame. With batched=True the visible
+# (surface, position) pairs of a layer are gathered into one reused list and submitted
+# with a single fblits/blits call; batched=False keeps one screen.blit per tile for comparison.
+class TileLayerRenderer:
+    def __init__(self, layers, tile_size, batched=True):
+        self.tile_size = tile_size
+        self.batched = batched
+        # Each layer keeps its tile id array plus a surface for every id it uses, so the
+        # draw loop slices the viewport out of the array and only indexes a list
+        self.layers = []
+        for tile_map, lookup in layers:
+            tile_map = np.asarray(tile_map)
+            max_id = int(tile_map.max()) if tile_map.size else -1
+            self.layers.append((tile_map, [lookup(tile_id) for tile_id in range(max_id + 1)]))
+        self.batch = []
+
+    def draw(self, screen, camera_offset):
+        size = self.tile_size
+        offset_x, offset_y = camera_offset
+        first_col = max(0, offset_x // size)
+        last_col = (offset_x + screen.get_width() - 1) // size
+        first_row = max(0, offset_y // size)
+        last_row = (offset_y + screen.get_height() - 1) // size
+        submit = getattr(screen, "fblits", None)
+        batch = self.batch
+
+        for tile_map, surfaces in self.layers:
+            batch.clear()
+            rows, cols, tile_ids = occupied_cells(tile_map[first_row:last_row + 1, first_col:last_col + 1])
+            xs = (cols + first_col) * size - offset_x
+            ys = (rows + first_row) * size - offset_y
+            for x, y, tile_id in zip(xs.tolist(), ys.tolist(), tile_ids.tolist()):
+                texture = surfaces[tile_id]
+                if texture is None:
+                    continue
+                if self.batched:
+                    batch.append((texture, (x, y)))
+                else:
+                    screen.blit(texture, (x, y))
+            if batch:
+                if submit is not None:
+                    submit(batch)
+                else:
+                    screen.blits(batch, doreturn=False)
+
+
+# --- SCROLL-REUSE RENDERER ---
+# Keeps the background color and static layers of the last frame in a view-sized render
+# target. When the camera moves, the target is scrolled by the camera delta and only the
+# strips that scrolled into view are drawn, so side-scrolling a few pixels a frame draws
+# two thin strips instead of every layer over the whole view. Sprites are drawn over it
+# by the caller as before. Wraps a ChunkRenderer or TileLayerRenderer holding all static layers.
+class ScrollingRenderer:
+    def __init__(self, renderer, background_color):
+        self.renderer = renderer
+        self.background_color = background_color
+        self.target = None
+        self.offset = None  # camera offset the target was drawn at, None to redraw it all
+        self.redrawn_pixels = 0  # target pixels drawn by the last draw()
+
+    def exposed_strips(self, camera_offset):
+        # Scrolls the target to camera_offset and returns the rects that need drawing
+        width, height = self.target.get_size()
+        if self.offset is None:
+            return [pygame.Rect(0, 0, width, height)]
+        dx = camera_offset[0] - self.offset[0]
+        dy = camera_offset[1] - self.offset[1]
+        if abs(dx) >= width or abs(dy) >= height:
+            return [pygame.Rect(0, 0, width, height)]
+        if dx or dy:
+            self.target.scroll(-dx, -dy)
+        strips = []
+        if dx:
+            strips.append(pygame.Rect(width - dx if dx > 0 else 0, 0, abs(dx), height))
+        if dy:
+            # Rows along the top or bottom, minus the corner the column strip already covers
+            left = 0 if dx > 0 else abs(dx)
+            strips.append(pygame.Rect(left, height - dy if dy > 0 else 0, width - abs(dx), abs(dy)))
+        return strips
+
+    def draw(self, screen, camera_offset):
+        if self.target is None or self.target.get_size() != screen.get_size():
+            self.target = pygame.Surface(screen.get_size()).convert()
+            self.offset = None
+        renderer = self.renderer
+        self.redrawn_pixels = 0
+        for strip in self.exposed_strips(camera_offset):
+            self.target.fill(self.background_color, strip)
+            # A subsurface makes the wrapped renderer cull and clip to the strip
+            strip_offset = (camera_offset[0] + strip.x, camera_offset[1] + strip.y)
+            if isinstance(renderer, ChunkRenderer):
+                renderer.draw(self.target.subsurface(strip), strip_offset, stream=False)
+            else:
+                renderer.draw(self.target.subsurface(strip), strip_offset)
+            self.redrawn_pixels += strip.width * strip.height
+        self.offset = camera_offset
+        if isinstance(renderer, ChunkRenderer) and renderer.streaming:
+            left, right, _, _ = renderer.visible_chunks(camera_offset, *self.target.get_size())
+            renderer.stream(left, right)
+        screen.blit(self.target, (0, 0))
+
+
+# --- TEXT RENDER CACHE ---
+# Keeps rendered text surfaces keyed by (font, text, antialias, color) with LRU eviction,
+# so HUD and menu strings are only re-rendered when their text actually changes.
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def debug_lines(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return [f"text cache {rate:.0f}% hits ({len(self.surfaces)})"]
+
+
+# --- OVERLAY CACHE ---
+# Full-screen overlays (menu dimming, fades) are created once per size and color instead of
+# allocating a new surface every frame; a fade only changes the cached surface's alpha.
+class OverlayCache:
+    def __init__(self):
+        self.surfaces = {}
+
+    def get(self, size, color, alpha):
+        key = (size, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = pygame.Surface(size)
+            surface.fill(color)
+        if surface.get_alpha() != alpha:
+            surface.set_alpha(alpha)
+        return surface
@@ -0,0 +1,124 @@
+import argparse
+import struct
+import time
+import zlib
+from pygame.locals import K_a, K_d, K_SPACE, K_LSHIFT
+from headless import ScriptedKeys, create_headless_world
+
+# --- INPUT RECORDING AND REPLAY ---
+# A recording is a small header followed by one fixed-size record per simulation tick:
+# the pressed game keys as a bitmask, the tick length in ms and a checksum of the player
+# position after the tick. Replaying feeds the same keys and dt back into a headless
+# GameWorld as fast as possible and checks the position checksum tick by tick.
+
+MAGIC = b"PREC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH")  # magic, version, tick rate, level name length (level name follows)
+RECORD = struct.Struct("<BdI")    # key bits, dt (ms, double so replayed timers match exactly), position checksum
+
+RECORDED_KEYS = (K_a, K_d, K_SPACE, K_LSHIFT)
+RESET_BIT = 0x80  # world.reset() happened right before this tick (restart, continue, main menu)
+
+
+def pack_keys(keys):
+    mask = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def unpack_keys(mask):
+    return ScriptedKeys({key for bit, key in enumerate(RECORDED_KEYS) if mask & (1 << bit)})
+
+
+def position_checksum(player):
+    return zlib.crc32(struct.pack("<ii", player.rect.x, player.rect.y))
+
+
+class InputRecorder:
+    def __init__(self, path, tick_rate, level_name):
+        self.path = path
+        self.file = open(path, "wb")
+        encoded_name = level_name.encode("utf-8")
+        self.file.write(HEADER.pack(MAGIC, VERSION, tick_rate, len(encoded_name)))
+        self.file.write(encoded_name)
+        self.pending_reset = False
+        self.ticks = 0  # records written so far
+
+    def mark_reset(self):
+        self.pending_reset = True
+
+    def record(self, keys, dt, player):
+        # Call after world.tick(keys, dt)
+        mask = pack_keys(keys)
+        if self.pending_reset:
+            mask |= RESET_BIT
+            self.pending_reset = False
+        self.file.write(RECORD.pack(mask, dt, position_checksum(player)))
+        self.ticks += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class Recording:
+    def __init__(self, tick_rate, level_name, records):
+        self.tick_rate = tick_rate
+        self.level_name = level_name  # older recordings hold the collision CSV path instead
+        self.records = records  # list of (mask, dt, checksum)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as recording_file:
+            data = recording_file.read()
+        magic, version, tick_rate, name_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+        offset = HEADER.size
+        level_name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        usable = len(data) - (len(data) - offset) % RECORD.size  # ignore a torn last record
+        records = list(RECORD.iter_unpack(data[offset:usable]))
+        return cls(tick_rate, level_name, records)
+
+
+def replay(world, recording, verify=True):
+    # Returns the first tick whose checksum differs from the recording, or None
+    for tick, (mask, dt, checksum) in enumerate(recording.records):
+        if mask & RESET_BIT:
+            world.reset()
+        world.tick(unpack_keys(mask), dt)
+        if verify and position_checksum(world.player) != checksum:
+            return tick
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an input recording headless and verify it.")
+    parser.add_argument("recording")
+    parser.add_argument("--repeat", type=int, default=1, help="replay this many times (for timing runs)")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    world = create_headless_world(recording.level_name)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        world.reset()
+        mismatch = replay(world, recording)
+        if mismatch is not None:
+            break
+    elapsed = time.perf_counter() - start
+
+    ticks = len(recording.records) * args.repeat
+    print(f"{len(recording.records)} ticks x {args.repeat} in {elapsed:.3f}s ({ticks / elapsed:.0f} ticks/s)")
+    if mismatch is None:
+        print("replay matches the recording")
+    else:
+        print(f"replay diverged at tick {mismatch}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
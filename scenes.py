@@ -0,0 +1,467 @@
+import pygame
+from pygame.locals import *
+from config import WIDTH, HEIGHT, BACKGROUND_COLOR
+
+# Heart images (lives HUD), looked up in the asset manager once preloading has loaded them
+HEART_IMAGES = [f"heart_{i}.png" for i in range(4)]
+
+
+# --- SCENES ---
+# Every screen of the game is a scene on the Game's scene stack: the main menu, gameplay and
+# the pause, settings, game-over and win menus on top of it. Each frame the Game pumps the
+# events once and hands every event to whichever scene is on top at that moment, so a key
+# press is never split between two readers or lost when a scene changes mid-frame.
+class Scene:
+    name = "scene"
+    overlay = False      # drawn over the scene below it instead of replacing it
+    pauses_below = True  # whether the scenes below stop updating while this one is shown
+
+    def __init__(self, game):
+        self.game = game
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self, screen, dt):
+        # Draws the frame and returns what to present: True for the whole screen, otherwise a
+        # list of the changed rects (empty when nothing changed)
+        return True
+
+    def invalidate(self):
+        # The window's contents were lost (uncovered, restored): the next draw must be complete
+        pass
+
+
+# Stands in for the sequence returned by pygame.key.get_pressed() during one simulation tick:
+# the keys held now plus the keys pressed since the last tick, so a tap that is released
+# again before the next tick still reaches the simulation
+class TickKeys:
+    def __init__(self, held, pressed):
+        self.held = held
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return self.held[key] or key in self.pressed
+
+
+class MenuScene(Scene):
+    name = "menu"
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.title_font = game.assets.font("Und_Font_Short.ttf", 72)
+        self.instruction_font = game.assets.font("Und_Font_Long.ttf", 28)
+        self.start_requested = False
+        self.shown = None  # (loaded, progress bar fill) the screen was last drawn with
+        self.prompt_rect = None
+
+    def handle_event(self, event):
+        if event.type == KEYDOWN:
+            if event.key == K_RETURN and self.game.preloader.done:
+                self.start_requested = True
+            elif event.key == K_ESCAPE:
+                self.game.quit()
+
+    def update(self, dt):
+        self.game.preloader.pump()
+        if self.start_requested:
+            self.game.start_game()  # first start: everything it needs is preloaded by now
+
+    def draw(self, screen, dt):
+        preloader, text_cache = self.game.preloader, self.game.text_cache
+        loaded = preloader.done
+        bar = pygame.Rect(WIDTH//2 - 150, HEIGHT - 76, 300, 16)
+        bar_fill = int((bar.width - 4) * preloader.progress)
+        # The menu is only redrawn when the loading state changes; after the first frame
+        # only the start prompt / progress bar area is pushed to the display
+        if (loaded, bar_fill) == self.shown:
+            return []
+        screen.fill((0, 0, 0))
+        screen.blit(text_cache.render(self.title_font, "Space Punk", True, (255, 255, 255)), (WIDTH//2 - 150, HEIGHT//3))
+        previous_prompt_rect = self.prompt_rect
+        if loaded:
+            self.prompt_rect = screen.blit(text_cache.render(self.instruction_font, "Press Enter To Start", True, (255, 255, 255)), (WIDTH//2 - 140, HEIGHT - 80))
+        else:
+            # Loading progress bar in place of the start prompt
+            self.prompt_rect = pygame.draw.rect(screen, (255, 255, 255), bar, 1)
+            screen.fill((255, 255, 255), (bar.x + 2, bar.y + 2, bar_fill, bar.height - 4))
+        screen.blit(text_cache.render(self.instruction_font, "Press ESC To Quit", True, (255, 255, 255)), (WIDTH//2 - 130, HEIGHT - 40))
+        first = self.shown is None
+        self.shown = (loaded, bar_fill)
+        return True if first else [previous_prompt_rect, self.prompt_rect]
+
+    def invalidate(self):
+        self.shown = None
+
+
+class PlayScene(Scene):
+    name = "play"
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.reset()
+
+    def reset(self):
+        self.flicker_timer = 0
+        self.show_flicker = True
+        self.pressed = set()  # keys pressed since the last simulation tick
+
+    def handle_event(self, event):
+        if event.type == KEYDOWN:
+            if event.key == K_ESCAPE:
+                self.game.push(PauseScene(self.game))
+            else:
+                self.pressed.add(event.key)
+
+    def update(self, dt):
+        game = self.game
+        world, timestep, recorder = game.world, game.timestep, game.recorder
+        if world.finished_game:
+            return
+        held = pygame.key.get_pressed()
+        for _ in range(timestep.advance(dt)):
+            keys = TickKeys(held, self.pressed)
+            world.tick(keys, timestep.step_ms)
+            if recorder:
+                recorder.record(keys, timestep.step_ms, world.player)
+            self.pressed = set()
+            if world.finished_game:
+                break
+
+        if game.scenes[-1] is self:
+            if world.finished_game:
+                game.push(WinScene(game))
+            elif world.show_game_over:
+                game.push(GameOverScene(game))
+
+    def draw(self, screen, dt):
+        game = self.game
+        world, profiler, assets, text_cache, hud_font = game.world, game.profiler, game.assets, game.text_cache, game.hud_font
+        render_alpha = game.timestep.alpha
+
+        # Camera follows the interpolated player position
+        render_x, render_y = world.player.render_pos(render_alpha)
+        camera_x = render_x + world.player.rect.width // 2 - WIDTH // 2
+        camera_y = render_y + world.player.rect.height // 2 - HEIGHT // 2
+        camera_x = max(0, camera_x)
+        camera_y = max(0, camera_y)
+        camera_offset = (camera_x, camera_y)
+
+        # The world goes into the low-resolution buffer when there is one; view_offset is
+        # the camera in that surface's pixels
+        scale = game.render_scale
+        world_surface = screen if game.world_buffer is None else game.world_buffer
+        view_offset = (camera_x // scale, camera_y // scale)
+
+        if not game.scroll_reuse:
+            world_surface.fill(BACKGROUND_COLOR)  # the scrolling render target brings its own background
+
+        # Draw static layers (decorations, tutorial decorations, main structure)
+        profiler.begin("draw_world")
+        game.static_renderer.draw(world_surface, view_offset)
+
+        if game.debug_mode:
+            # Outline the merged collision rects in view
+            for solid_rect in game.collision_grid.overlapping(pygame.Rect(camera_offset, (WIDTH, HEIGHT))):
+                outline = pygame.Rect(solid_rect.x // scale - view_offset[0], solid_rect.y // scale - view_offset[1],
+                                      solid_rect.width // scale, solid_rect.height // scale)
+                pygame.draw.rect(world_surface, (255, 0, 0, 100), outline, 2)
+        profiler.end("draw_world")
+
+        profiler.begin("draw_sprites")
+        world.enemies.draw(world_surface, view_offset, render_alpha, game.debug_mode, scale)
+
+        for checkpoint in world.checkpoints:
+                checkpoint.draw(world_surface, view_offset, scale)
+
+        world.player.draw(world_surface, view_offset, render_alpha, game.debug_mode, scale)
+
+        world.finish_flag.draw(world_surface, view_offset, scale)
+        profiler.end("draw_sprites")
+
+        if game.world_buffer is not None:
+            # The single scaled present of the world buffer onto the window
+            profiler.begin("present")
+            pygame.transform.scale(game.world_buffer, (WIDTH, HEIGHT), screen)
+            profiler.end("present")
+
+        profiler.begin("draw_hud")
+
+        text = text_cache.render(hud_font, f"Kills: {world.kill_count}", True, (0, 0, 0))
+
+        if not world.death_state:
+            heart_index = max(0, 3 - world.player_lives)
+            heart_img = assets.image(HEART_IMAGES[heart_index])
+            screen.blit(heart_img, (WIDTH - 42, HEIGHT - 42))
+            lives_text = text_cache.render(hud_font, f"{world.player_lives}/3", True, (0, 0, 0))
+            screen.blit(lives_text, (WIDTH - 90, HEIGHT - 35))
+        else:
+            # Player is dead, flicker sad heart before broken heart
+            elapsed = world.time - world.death_timer
+            if elapsed < 3000:
+                self.flicker_timer += dt
+                if self.flicker_timer >= 425:
+                    self.flicker_timer = 0
+                    self.show_flicker = not self.show_flicker
+                if self.show_flicker:
+                    heart_img = assets.image(HEART_IMAGES[2])  # sad face heart (heart_2.png)
+                    screen.blit(heart_img, (WIDTH - 42, HEIGHT - 42))
+                    lives_text = text_cache.render(hud_font, "0/3", True, (0, 0, 0))
+                    screen.blit(lives_text, (WIDTH - 90, HEIGHT - 35))
+            else:
+                heart_img = assets.image(HEART_IMAGES[3])  # broken heart (heart_3.png)
+                screen.blit(heart_img, (WIDTH - 42, HEIGHT - 42))
+                lives_text = text_cache.render(hud_font, "0/3", True, (0, 0, 0))
+                screen.blit(lives_text, (WIDTH - 90, HEIGHT - 35))
+
+        screen.blit(text, (10, 10))
+
+        for checkpoint in world.checkpoints:
+            if checkpoint.display_message:
+                message = text_cache.render(game.message_font, "Your Progress Has Been Saved", True, (0, 255, 0))
+                msg_rect = message.get_rect(center=(WIDTH // 2, 40))
+                screen.blit(message, msg_rect)
+        profiler.end("draw_hud")
+        return True
+
+    def debug_lines(self):
+        player = self.game.world.player
+        return [
+            f"pos {player.rect.x},{player.rect.y}  vel_y {player.vel_y:.1f}",
+            f"jumps {player.jumps_remaining}  on_ground {player.on_ground}",
+            f"dropped {self.game.timestep.dropped_ms:.0f} ms",
+        ] + [f"input {name} {mean:.1f} ms (max {worst:.1f})"
+             for name, (_, mean, worst) in self.game.input_latency.summary().items()]
+
+
+# --- MENU OVERLAYS ---
+# Menus shown over gameplay. The Game draws the scene underneath, then draw_overlay() (the
+# full-screen dimming or fade) and draw_items() (text and selection boxes). While is_static()
+# holds, the scene underneath no longer changes on screen, so the Game keeps a copy of it with
+# the overlay and only redraws the items when menu_state() changes (see Game.draw).
+class OverlayScene(Scene):
+    overlay = True
+
+    def is_static(self):
+        return True
+
+    def menu_state(self):
+        # Everything the menu items are drawn from; they only need redrawing when it changes
+        return ()
+
+    def draw_overlay(self, screen):
+        pass
+
+    def draw_items(self, screen):
+        # Returns the screen rects the items touched
+        return []
+
+
+class PauseScene(OverlayScene):
+    name = "pause"
+    options = ["Resume","Restart", "Settings", "Main Menu"]
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.index = 0
+        self.confirm_main_menu = False
+
+    def handle_event(self, event):
+        if event.type != KEYDOWN:
+            return
+        game = self.game
+        if event.key == K_ESCAPE:
+            game.pop()
+        elif event.key in [K_w, K_UP]:
+            self.index = (self.index - 1) % len(self.options)
+        elif event.key in [K_s, K_DOWN]:
+            self.index = (self.index + 1) % len(self.options)
+        elif event.key in [K_SPACE, K_RETURN]:
+            selected = self.options[self.index]
+            if selected == "Resume":
+                game.pop()
+            elif selected == "Restart":
+                game.start_game()
+            elif selected == "Settings":
+                game.push(SettingsScene(game))
+            elif selected == "Main Menu":
+                if self.confirm_main_menu:
+                    game.return_to_menu()
+                else:
+                    self.confirm_main_menu = True
+
+    def menu_state(self):
+        return (self.index, self.confirm_main_menu)
+
+    def draw_overlay(self, screen):
+        screen.blit(self.game.overlays.get((WIDTH, HEIGHT), (0, 0, 0), 180), (0, 0))
+
+    def draw_items(self, screen):
+        text_cache = self.game.text_cache
+        rects = []
+        for i, option in enumerate(self.options):
+            color = (255, 255, 255)
+            rendered = text_cache.render(self.game.pause_font, option, True, color)
+            rect = rendered.get_rect(center=(WIDTH // 2, HEIGHT // 2 + i * 50))
+            rects.append(screen.blit(rendered, rect))
+            if i == self.index:
+                rects.append(pygame.draw.rect(screen, (255, 255, 255), rect.inflate(10, 10), 2))
+
+        if self.confirm_main_menu and self.options[self.index] == "Main Menu":
+            msg = text_cache.render(self.game.confirm_font, "Press Enter again to return to menu", True, (255, 100, 100))
+            rects.append(screen.blit(msg, msg.get_rect(center=(WIDTH // 2, HEIGHT // 2 + len(self.options) * 60))))
+        return rects
+
+
+class SettingsScene(PauseScene):
+    name = "settings"
+    options = ["Return", "Save", "DEBUG", "Pacing", "Dump Trace", "Dump Pacing"]
+
+    def handle_event(self, event):
+        if event.type != KEYDOWN:
+            return
+        game = self.game
+        if event.key == K_ESCAPE:
+            game.pop()
+        elif event.key in [K_w, K_UP]:
+            self.index = (self.index - 1) % len(self.options)
+        elif event.key in [K_s, K_DOWN]:
+            self.index = (self.index + 1) % len(self.options)
+        elif event.key in [K_SPACE, K_RETURN]:
+            selected_setting = self.options[self.index]
+            if selected_setting == "Return":
+                game.pop()
+            elif selected_setting == "DEBUG":
+                game.set_debug(not game.debug_mode)
+            elif selected_setting == "Pacing":
+                game.pacer.next_mode()
+            elif selected_setting == "Dump Trace":
+                print(f"Profiler trace written to {game.profiler.dump_trace(game.trace_path)}")
+            elif selected_setting == "Dump Pacing":
+                print(f"Frame pacing statistics written to {game.pacer.dump(game.pacing_path)}")
+
+    def menu_state(self):
+        return (self.index, self.game.debug_mode, self.game.pacer.mode)
+
+    def option_label(self, option):
+        if option == "DEBUG":
+            return option + (" : ON" if self.game.debug_mode else " : OFF")
+        if option == "Pacing":
+            return f"{option} : {self.game.pacer.mode}"
+        return option
+
+    def draw_items(self, screen):
+        text_cache = self.game.text_cache
+        rects = []
+        for i, option in enumerate(self.options):
+            color = (255, 255, 255)
+            rendered = text_cache.render(self.game.pause_font, self.option_label(option), True, color)
+            rect = rendered.get_rect(center=(WIDTH // 2, HEIGHT // 2 + i * 50))
+            rects.append(screen.blit(rendered, rect))
+            if i == self.index:
+                rects.append(pygame.draw.rect(screen, (255, 255, 255), rect.inflate(10, 10), 2))
+        return rects
+
+
+class GameOverScene(OverlayScene):
+    name = "game_over"
+    pauses_below = False  # the world keeps running under the fade
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.selection = 0
+        self.confirm_quit = False
+
+    def fade_elapsed(self):
+        world = self.game.world
+        return world.time - world.fade_start
+
+    def is_static(self):
+        # Only once the fade to black is complete
+        return self.fade_elapsed() > 2000
+
+    def handle_event(self, event):
+        # Input handling during game over
+        if event.type != KEYDOWN or not self.is_static():
+            return
+        if event.key in [K_a, K_LEFT]:
+            self.selection = (self.selection - 1) % 2
+        elif event.key in [K_d, K_RIGHT]:
+            self.selection = (self.selection + 1) % 2
+        elif event.key in [K_RETURN, K_SPACE]:
+            if self.selection == 0:
+                # Continue game
+                self.game.start_game()
+            elif self.selection == 1:
+                if not self.confirm_quit:
+                    self.confirm_quit = True
+                else:
+                    self.game.return_to_menu()
+
+    def menu_state(self):
+        return (self.selection, self.confirm_quit)
+
+    def draw_overlay(self, screen):
+        alpha = min(255, int((self.fade_elapsed() / 2000) * 255))
+        screen.blit(self.game.overlays.get((WIDTH, HEIGHT), (0, 0, 0), alpha), (0, 0))
+
+    def draw_items(self, screen):
+        if not self.is_static():
+            return []
+        text_cache, small_font = self.game.text_cache, self.game.small_font
+        died_text = text_cache.render(self.game.big_font, "You Died", True, (255, 0, 0))
+        try_again = text_cache.render(small_font, "Continue or Quit?", True, (255, 255, 255))
+
+        rects = [screen.blit(died_text, died_text.get_rect(center=(WIDTH // 2, HEIGHT // 3))),
+                 screen.blit(try_again, try_again.get_rect(center=(WIDTH // 2, HEIGHT // 2)))]
+
+        options = ["Continue", "Quit"]
+        for i, option in enumerate(options):
+            color = (0, 255, 0) if i == 0 else (255, 0, 0)
+            if self.selection == i:
+                rendered = text_cache.render(small_font, option, True, color)
+            else:
+                rendered = text_cache.render(small_font, option, True, (255, 255, 255))
+            rects.append(screen.blit(rendered, rendered.get_rect(center=(WIDTH // 2 - 100 + 200 * i, HEIGHT // 2 + 60))))
+
+        if self.confirm_quit and self.selection == 1:
+            warning = text_cache.render(small_font, "If you quit now, any progress will be lost.", True, (255, 100, 100))
+            rects.append(screen.blit(warning, warning.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 120))))
+        return rects
+
+
+class WinScene(OverlayScene):
+    name = "win"
+
+    def can_continue(self):
+        return self.game.level_info.next_level and not self.game.recorder
+
+    def handle_event(self, event):
+        if event.type != KEYDOWN:
+            return
+        if event.key == K_RETURN:
+            self.game.return_to_menu()
+        elif event.key == K_n and self.can_continue():
+            self.game.start_game(self.game.level_info.next_level)
+        elif event.key == K_q:
+            self.game.quit()
+
+    def draw_overlay(self, screen):
+        screen.blit(self.game.overlays.get((WIDTH, HEIGHT), (255, 255, 255), 200), (0, 0))
+
+    def draw_items(self, screen):
+        text_cache, small_font = self.game.text_cache, self.game.small_font
+        congrats_text = text_cache.render(self.game.big_font, "You Win!", True, (0, 128, 0))
+        info_text = text_cache.render(small_font, "Press ENTER to return to menu", True, (0, 0, 0))
+        quit_text = text_cache.render(small_font, "Press Q to quit", True, (128, 0, 0))
+        rects = [screen.blit(congrats_text, congrats_text.get_rect(center=(WIDTH // 2, HEIGHT // 3))),
+                 screen.blit(info_text, info_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))),
+                 screen.blit(quit_text, quit_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50)))]
+
+        if self.can_continue():
+            next_text = text_cache.render(small_font, "Press N for the next level", True, (0, 0, 0))
+            rects.append(screen.blit(next_text, next_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 100))))
+        return rects
@@ -0,0 +1,57 @@
+import random
+import numpy as np
+import pytest
+from activity import advance_patrol
+from assets import AssetManager
+from conftest import ROOT
+from entities import EnemyManager
+
+
+@pytest.fixture
+def assets(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    return AssetManager(convert=False)
+
+
+def random_spawns(rng, count):
+    # (x, y, patrol_min, patrol_max) with x inside the patrol range
+    spawns = []
+    for _ in range(count):
+        patrol_min = rng.randint(0, 2000)
+        patrol_max = patrol_min + rng.randint(0, 300)
+        spawns.append((rng.randint(patrol_min, patrol_max), 100, patrol_min, patrol_max))
+    return spawns
+
+
+def random_enemies(assets, rng, count=200):
+    enemies = EnemyManager(random_spawns(rng, count), assets)
+    enemies.speed[:] = [rng.randint(1, 4) for _ in range(count)]
+    enemies.direction[:] = [rng.choice((-1, 1)) for _ in range(count)]
+    return enemies
+
+
+def test_advance_patrol_matches_ticking(assets):
+    rng = random.Random(17)
+    enemies = random_enemies(assets, rng)
+    start_x, start_direction = enemies.x.copy(), enemies.direction.copy()
+    for ticks in range(1, 400):
+        enemies.update(1000 / 60)
+        x, direction = advance_patrol(start_x, start_direction, enemies.speed, enemies.patrol_min,
+                                      enemies.patrol_max, ticks)
+        assert np.array_equal(x, enemies.x), ticks
+        assert np.array_equal(direction, enemies.direction), ticks
+
+
+def test_sleeping_enemies_catch_up_exactly(assets):
+    rng = random.Random(42)
+    awake = random_enemies(assets, rng)
+    sleeping = random_enemies(assets, random.Random(42))
+    far_away = (100000, 101000)
+    for tick in range(1000):
+        awake.update(1000 / 60)
+        # Alternate between a far away span (every enemy sleeps) and a full wake-up
+        sleeping.update(1000 / 60, None if tick % 97 == 0 else far_away)
+    sleeping.update(1000 / 60)
+    awake.update(1000 / 60)
+    assert np.array_equal(sleeping.x, awake.x)
+    assert np.array_equal(sleeping.direction, awake.direction)
@@ -0,0 +1,54 @@
+import random
+import numpy as np
+import pygame
+from collision import TileGrid
+
+TILE = 32
+
+
+def step_move(grid, rect, dx, dy):
+    # Reference: move one pixel at a time and stop before the first step that touches a solid rect
+    step_x, step_y = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+    moved = rect.copy()
+    for _ in range(max(abs(dx), abs(dy))):
+        candidate = moved.move(step_x, step_y)
+        if candidate.collidelist(grid.rects) != -1:
+            return moved.x - rect.x, moved.y - rect.y, True
+        moved = candidate
+    return dx, dy, False
+
+
+def random_grid(rng):
+    tile_map = np.where(rng.random((12, 30)) < 0.2, 1, -1)
+    return TileGrid(tile_map, TILE)
+
+
+def free_rect(grid, rng):
+    # A player-sized rect inside the map that doesn't overlap any solid rect
+    while True:
+        rect = pygame.Rect(int(rng.integers(TILE, 29 * TILE - 29)), int(rng.integers(0, 12 * TILE - 64)), 29, 64)
+        if rect.collidelist(grid.rects) == -1:
+            return rect
+
+
+def test_sweep_matches_per_pixel_stepping():
+    rng = np.random.default_rng(15)
+    moves = random.Random(15)
+    for _ in range(40):
+        grid = random_grid(rng)
+        for _ in range(100):
+            rect = free_rect(grid, rng)
+            distance = moves.randint(-96, 96)
+            dx, dy = (distance, 0) if moves.random() < 0.5 else (0, distance)
+            moved_x, moved_y, hit = grid.sweep(rect, dx, dy)
+            assert (moved_x, moved_y, hit is not None) == step_move(grid, rect, dx, dy), (rect, dx, dy)
+
+
+def test_sweep_does_not_tunnel_through_thin_walls():
+    tile_map = np.full((6, 20), -1)
+    tile_map[:, 10] = 1  # one tile thick wall
+    grid = TileGrid(tile_map, TILE)
+    rect = pygame.Rect(2 * TILE, TILE, 29, 64)
+    moved_x, _, hit = grid.sweep(rect, 15 * TILE, 0)
+    assert hit is not None
+    assert rect.x + moved_x + rect.width == 10 * TILE
@@ -0,0 +1,94 @@
+import json
+import os
+import numpy as np
+import pytest
+from conftest import ROOT
+from level import LevelManifest, compile_level, compiled_sources, load_compiled, load_level, load_tile_map
+
+
+def write_csv(path, rows):
+    path.write_text("\n".join(",".join(str(cell) for cell in row) for row in rows) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def layer_paths(tmp_path):
+    rng = np.random.default_rng(12)
+    structure = np.where(rng.random((9, 23)) < 0.3, rng.integers(0, 32768, (9, 23)), -1)
+    structure[0, 0] = 32767
+    decorations = structure[::-1].tolist()
+    decorations[1][2] = " x"  # anything that isn't a tile id loads as empty
+    return {
+        "structure": write_csv(tmp_path / "structure.csv", structure.tolist()),
+        "decorations": write_csv(tmp_path / "decorations.csv", decorations),
+    }
+
+
+def test_compiled_level_round_trip(tmp_path, layer_paths):
+    output = str(tmp_path / "level.lvl")
+    compile_level(output, layer_paths)
+    layers = load_level(output)
+    assert list(layers) == list(layer_paths)
+    for name, path in layer_paths.items():
+        assert layers[name].dtype == np.int16
+        assert np.array_equal(layers[name], load_tile_map(path))
+    assert compiled_sources(output) == layer_paths
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_shipped_levels_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    manifest = LevelManifest.load()
+    for name, level in manifest.levels.items():
+        output = str(tmp_path / f"{name}.lvl")
+        compile_level(output, level.layer_paths)
+        layers = load_level(output)
+        for layer_name, path in level.layer_paths.items():
+            assert np.array_equal(layers[layer_name], load_tile_map(path)), (name, layer_name)
+
+
+def test_compile_level_rejects_what_the_format_cannot_hold(tmp_path, layer_paths):
+    output = str(tmp_path / "level.lvl")
+    with pytest.raises(ValueError):
+        compile_level(output, {"a_layer_name_over_16": layer_paths["structure"]})
+    with pytest.raises(ValueError):
+        compile_level(output, {"structure": write_csv(tmp_path / "big.csv", [[0, 40000]])})
+    assert not os.path.exists(output)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_load_compiled_recompiles_when_the_layers_change(tmp_path, layer_paths):
+    output = str(tmp_path / "level.lvl")
+    original = {"structure": layer_paths["structure"]}
+    assert list(load_compiled(output, original)) == ["structure"]
+
+    # Same CSVs and mtimes, but a layer added and another CSV behind a layer name
+    changed = {"structure": layer_paths["decorations"], "extra": layer_paths["structure"]}
+    layers = load_compiled(output, changed)
+    assert list(layers) == ["structure", "extra"]
+    assert np.array_equal(layers["structure"], load_tile_map(layer_paths["decorations"]))
+    assert compiled_sources(output) == changed
+
+
+def test_load_compiled_recompiles_older_format_versions(tmp_path, layer_paths):
+    output = tmp_path / "level.lvl"
+    output.write_bytes(b"PLVL\x01\x00")
+    layers = load_compiled(str(output), layer_paths)
+    assert np.array_equal(layers["structure"], load_tile_map(layer_paths["structure"]))
+
+
+def test_manifest_layers_match_compiled_cache(tmp_path, monkeypatch):
+    # levels.json edited without touching any CSV: the level picks up the new layer set
+    monkeypatch.chdir(ROOT)
+    with open("levels.json") as manifest_file:
+        data = json.load(manifest_file)
+    level = data["levels"]["map_2"]
+    monkeypatch.chdir(tmp_path)
+    for layer in level["layers"]:
+        layer["csv"] = os.path.join(ROOT, layer["csv"])
+    (tmp_path / "levels.json").write_text(json.dumps(data))
+    assert list(LevelManifest.load().get("map_2").load_layers()) == ["decorations", "structure"]
+
+    level["layers"].append({"name": "copy", "csv": level["layers"][0]["csv"], "tileset": "tilemap.png"})
+    (tmp_path / "levels.json").write_text(json.dumps(data))
+    assert list(LevelManifest.load().get("map_2").load_layers()) == ["decorations", "structure", "copy"]
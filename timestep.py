@@ -0,0 +1,35 @@
+# --- FIXED TIMESTEP ---
+# Accumulates real frame time and turns it into a whole number of fixed simulation ticks,
+# so physics runs at tick_rate no matter how fast frames are rendered. alpha is how far
+# the renderer is between the last two ticks and is used to interpolate drawing.
+class FixedTimestep:
+    def __init__(self, tick_rate=60, max_steps=5):
+        self.tick_rate = tick_rate
+        self.step_ms = 1000 / tick_rate
+        self.max_steps = max_steps  # max catch-up ticks per frame before dropping time
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0
+
+    def advance(self, frame_ms):
+        self.accumulator += frame_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # Too far behind (e.g. the window was dragged): drop the backlog instead of spiralling
+            self.dropped_ms += (steps - self.max_steps) * self.step_ms
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step_ms
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.step_ms
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+def interpolate(previous, current, alpha):
+    return (round(previous[0] + (current[0] - previous[0]) * alpha),
+            round(previous[1] + (current[1] - previous[1]) * alpha))
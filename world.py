@@ -0,0 +1,101 @@
+from activity import RegionIndex, active_span
+from config import WIDTH, HEIGHT, JUMP_STRENGTH, TILE_SIZE, ACTIVE_MARGIN, REGION_WIDTH
+from entities import Checkpoint, EnemyManager, FinishFlag, Player
+
+# --- GAME WORLD ---
+# All game-logic state (player, enemies, checkpoints, lives, kills, death) and the fixed
+# simulation tick. It never touches the display or the real clock: time only moves
+# when tick() is called, so it runs the same in the game window and headless.
+# Checkpoints, the finish flag and enemies are only updated near the camera (see activity.py).
+class GameWorld:
+    def __init__(self, assets, collision_grid, player_start, checkpoint_positions, finish_flag_position, enemy_data):
+        self.assets = assets
+        self.collision_grid = collision_grid
+        self.player_start = player_start
+        self.checkpoint_positions = checkpoint_positions
+        self.finish_flag_position = finish_flag_position
+        self.enemy_data = enemy_data
+        self.reset()
+
+    def reset(self):
+        self.time = 0  # simulated ms since reset
+        self.finish_flag = FinishFlag(*self.finish_flag_position, self.assets)
+        self.finished_game = False
+
+        self.player_lives = 3
+        self.kill_count = 0
+        self.death_state = False
+        self.death_timer = 0
+        self.show_game_over = False
+        self.fade_start = 0
+
+        self.current_checkpoint = self.player_start
+        self.player = Player(*self.player_start, self.assets, self.collision_grid)
+        self.player.input_blocked_until = self.time + 500
+        self.enemies = EnemyManager([(x * TILE_SIZE, y * TILE_SIZE, start * TILE_SIZE, end * TILE_SIZE) for x, y, start, end in self.enemy_data], self.assets)
+        self.checkpoints = [Checkpoint(x, y, self.assets) for x, y in self.checkpoint_positions]
+        self.checkpoint_regions = RegionIndex([(c.rect.left, c.rect.right) for c in self.checkpoints], REGION_WIDTH)
+        self.announcing = set()  # checkpoints showing their message, kept updating until it times out
+
+    def active_span(self):
+        return active_span(self.player.rect.centerx, WIDTH, ACTIVE_MARGIN)
+
+    def lose_life(self):
+        self.player_lives -= 1
+        if self.player_lives <= 0:
+            self.death_state = True
+            self.death_timer = self.time
+        else:
+            self.player.respawn(self.current_checkpoint)
+
+    # --- SIMULATION TICK ---
+    # One fixed step of game logic; dt is the tick length in ms
+    def tick(self, keys, dt):
+        self.time += dt
+        player = self.player
+
+        # Update checkpoints near the player, plus any still showing its message
+        left, right = self.active_span()
+        for index in sorted(self.announcing.union(self.checkpoint_regions.query(left, right))):
+            checkpoint = self.checkpoints[index]
+            checkpoint.update(dt)
+            if not checkpoint.display_message:
+                self.announcing.discard(index)
+            if player.rect.colliderect(checkpoint.rect) and not checkpoint.activated:
+                checkpoint.activated = True
+                self.current_checkpoint = (checkpoint.rect.x, checkpoint.rect.y)
+                checkpoint.display_message = True
+                checkpoint.message_timer = 2000  # ms
+                self.announcing.add(index)
+
+        # Update final flag
+        if left < self.finish_flag.rect.right and self.finish_flag.rect.left < right:
+            self.finish_flag.update(dt)
+        if player.rect.colliderect(self.finish_flag.rect):
+            self.finished_game = True
+
+        if self.death_state:
+            elapsed = self.time - self.death_timer
+
+            if elapsed >= 4000 and not self.show_game_over:
+                self.show_game_over = True
+                self.fade_start = self.time
+            player.prev_pos = player.rect.topleft  # frozen while dead
+
+        else:
+            if self.time >= player.input_blocked_until:
+                player.move(keys)
+            player.update(dt)
+            if player.rect.top > HEIGHT:                                        # Fell out of the level
+                self.lose_life()
+            self.enemies.update(dt, self.active_span())                         # Around the player after it moved
+            for index in self.enemies.overlapping(player.rect):                     # Check for collision with enemies
+                if not player.rect.colliderect(self.enemies.rect(index)):           # Player respawned since the test
+                    continue
+                if player.vel_y > 0:                                                # Jumping on enemy
+                    self.enemies.kill(index)                                        # Kill enemy
+                    player.vel_y = JUMP_STRENGTH * 0.7                              # Bounce off enemy
+                    self.kill_count += 1                                            # Increment kill count
+                    player.jumps_remaining = player.max_jumps                       # Regains double jumps after killing enemy
+                else:
+                    self.lose_life()